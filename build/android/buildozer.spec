@@ -24,7 +24,7 @@ version = 0.1.0
 
 # Minimal dependencies — websockets is pure Python (no C extensions)
 # Removed FastAPI/uvicorn (too many C deps), using websockets server directly
-requirements = python3,android,websockets,pyserial
+requirements = python3,android,websockets,pyserial,msgpack
 
 # Android permissions for network + hardware access
 android.permissions = INTERNET,BLUETOOTH,BLUETOOTH_ADMIN,BLUETOOTH_CONNECT,BLUETOOTH_SCAN,ACCESS_FINE_LOCATION,FOREGROUND_SERVICE
@@ -16,6 +16,12 @@ import uvicorn
 from . import __version__
 from .config import BridgeConfig
 
+try:
+    import uvloop  # noqa: F401 — not available on Windows
+    EVENT_LOOP = 'uvloop'
+except ImportError:
+    EVENT_LOOP = 'asyncio'
+
 
 def setup_logging(level: str = 'info'):
     """Configure logging for the bridge."""
@@ -72,7 +78,7 @@ def main():
     logger = logging.getLogger('erplora.bridge')
     logger.info(f"ERPlora Bridge v{__version__}")
     logger.info(f"Config: {config._path}")
-    logger.info(f"Starting WebSocket server on {host}:{port}")
+    logger.info(f"Starting WebSocket server on {host}:{port} ({EVENT_LOOP} loop)")
 
     uvicorn.run(
         'erplora_bridge.server:app',
@@ -80,6 +86,7 @@ def main():
         port=port,
         log_level=log_level,
         ws='websockets',
+        loop=EVENT_LOOP,
     )
 
 
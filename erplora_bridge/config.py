@@ -8,8 +8,11 @@ import json
 import os
 import platform
 import sys
+import threading
 from pathlib import Path
 
+from .protocol import to_json_bytes
+
 
 # Default WebSocket port
 DEFAULT_PORT = 12321
@@ -17,14 +20,19 @@ DEFAULT_PORT = 12321
 # Config filename
 CONFIG_FILENAME = 'bridge_config.json'
 
+# Delay before persisting changes, so bursts of setter calls cost one write
+SAVE_DEBOUNCE_S = 0.2
 
-def get_config_dir() -> Path:
-    """Get the platform-specific config directory for ERPlora Bridge."""
-    system = platform.system()
 
-    if system == 'Darwin':
+# Host OS, resolved once at import
+_SYSTEM = platform.system()
+
+
+def _compute_config_dir() -> Path:
+    """Resolve and create the platform-specific config directory."""
+    if _SYSTEM == 'Darwin':
         base = Path.home() / 'Library' / 'Application Support'
-    elif system == 'Windows':
+    elif _SYSTEM == 'Windows':
         base = Path(os.environ.get('APPDATA', Path.home() / 'AppData' / 'Roaming'))
     else:
         # Linux / other
@@ -35,6 +43,14 @@ def get_config_dir() -> Path:
     return config_dir
 
 
+_CONFIG_DIR = _compute_config_dir()
+
+
+def get_config_dir() -> Path:
+    """Get the platform-specific config directory for ERPlora Bridge."""
+    return _CONFIG_DIR
+
+
 def get_config_path() -> Path:
     """Get the full path to the config file."""
     return get_config_dir() / CONFIG_FILENAME
@@ -63,6 +79,9 @@ class BridgeConfig:
     def __init__(self):
         self._path = get_config_path()
         self._data = dict(DEFAULT_CONFIG)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: threading.Timer | None = None
         self.load()
 
     def load(self):
@@ -78,9 +97,33 @@ class BridgeConfig:
             self.save()
 
     def save(self):
-        """Persist config to file."""
-        with open(self._path, 'w') as f:
-            json.dump(self._data, f, indent=2)
+        """Persist config to file immediately."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._dirty = False
+
+            # Write to a sibling file and rename so readers never see a torn
+            # file; done under the lock so concurrent saves can't interleave
+            tmp = self._path.with_suffix('.tmp')
+            tmp.write_bytes(to_json_bytes(self._data))
+            os.replace(tmp, self._path)
+
+    def flush(self):
+        """Write pending changes now instead of waiting for the debounce timer."""
+        if self._dirty:
+            self.save()
+
+    def _schedule_save(self):
+        """Mark config dirty and (re)start the debounced save timer."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            # Non-daemon so a pending write still lands if the process exits
+            self._save_timer = threading.Timer(SAVE_DEBOUNCE_S, self.flush)
+            self._save_timer.start()
 
     @property
     def port(self) -> int:
@@ -89,7 +132,7 @@ class BridgeConfig:
     @port.setter
     def port(self, value: int):
         self._data['port'] = value
-        self.save()
+        self._schedule_save()
 
     @property
     def host(self) -> str:
@@ -112,7 +155,7 @@ class BridgeConfig:
 
     def set(self, key: str, value):
         self._data[key] = value
-        self.save()
+        self._schedule_save()
 
     def __repr__(self):
         return f"BridgeConfig({self._data})"
@@ -2,9 +2,19 @@
 Hardware discovery — find printers via USB, network, and Bluetooth.
 """
 
+import asyncio
+import atexit
+import concurrent.futures
+import errno
 import logging
 import platform
+import re
+import selectors
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any
 
 from ..protocol import printer_info
@@ -30,6 +40,47 @@ KNOWN_PRINTER_VENDORS = {
 # Default ESC/POS network port
 ESCPOS_NETWORK_PORT = 9100
 
+# Max concurrent USB string descriptor reads during discovery
+USB_DESCRIPTOR_WORKERS = 8
+
+# Max sockets with a connect in flight during the subnet port scan. Kept well
+# under the 256 soft fd limit macOS gives apps launched from Finder.
+NETWORK_SCAN_MAX_SOCKETS = 64
+
+# mDNS discovery: max total wait, and quiet period after the last answer
+MDNS_TIMEOUT_S = 1.5
+MDNS_SETTLE_S = 0.3
+
+# Common printer service types
+MDNS_SERVICE_TYPES = ('_pdl-datastream._tcp.local.', '_ipp._tcp.local.')
+
+# Shared Zeroconf instance, started on first discovery and kept running
+_mdns_zc: Any = None
+_mdns_browsers: list[Any] = []
+_mdns_lock = threading.Lock()
+_mdns_services: dict[str, Any] = {}  # service name -> ServiceInfo
+_mdns_arrived = threading.Event()
+
+# BLE scan duration; scans run on one lazily started background loop
+BLUETOOTH_SCAN_TIMEOUT_S = 3.0
+_bt_loop: asyncio.AbstractEventLoop | None = None
+_bt_loop_lock = threading.Lock()
+
+# How long a resolved local IP address is reused before re-checking
+LOCAL_IP_CACHE_TTL_S = 30.0
+_local_ip_cache: tuple[float, str] | None = None  # (monotonic timestamp, ip)
+
+# Bluetooth device names that look like a receipt printer
+_BT_PRINTER_NAME_RE = re.compile(r'print|pos|thermal|escpos|star|epson|bixolon', re.IGNORECASE)
+
+# connect_ex() results meaning a non-blocking connect is under way
+_CONNECT_IN_PROGRESS = {
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EALREADY,
+    getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK),
+}
+
 
 def discover_all() -> list[dict]:
     """Discover all available printers (USB + network + Bluetooth).
@@ -45,6 +96,18 @@ def discover_all() -> list[dict]:
     return printers
 
 
+# printer_info with the fields shared by every USB printer pre-bound
+_usb_printer_info = partial(printer_info, printer_type='usb', status='ready')
+
+
+def _safe_product(device: Any) -> str | None:
+    """Read a USB device's product string, or None if it can't be read."""
+    try:
+        return device.product
+    except Exception:
+        return None
+
+
 def discover_usb() -> list[dict]:
     """Discover USB-connected ESC/POS printers."""
     printers = []
@@ -60,31 +123,29 @@ def discover_usb() -> list[dict]:
         if devices is None:
             return printers
 
+        # Filter on the cached idVendor attribute first — only known printer
+        # vendors get their IDs formatted and the (slow) descriptor read below.
+        candidates = []
         for device in devices:
-            vendor_id = device.idVendor
-            product_id = device.idProduct
-
-            vendor_name = KNOWN_PRINTER_VENDORS.get(vendor_id)
-            if vendor_name is None:
-                continue  # Not a known printer vendor
+            vendor_name = KNOWN_PRINTER_VENDORS.get(device.idVendor)
+            if vendor_name is not None:
+                candidates.append((device, vendor_name))
+        if not candidates:
+            return printers
 
-            printer_id = f"usb:{vendor_id:#06x}:{product_id:#06x}"
+        # Reading device.product issues a USB control transfer; overlap them
+        with ThreadPoolExecutor(max_workers=USB_DESCRIPTOR_WORKERS) as executor:
+            products = list(executor.map(_safe_product, (d for d, _ in candidates)))
 
-            try:
-                name = device.product or f"{vendor_name} Printer"
-            except Exception:
-                name = f"{vendor_name} Printer"
+        for (device, vendor_name), product in zip(candidates, products):
+            printer_id = "usb:0x%04x:0x%04x" % (device.idVendor, device.idProduct)
+            name = product or f"{vendor_name} Printer"
 
-            printers.append(printer_info(
-                printer_id=printer_id,
-                name=name,
-                printer_type='usb',
-                status='ready',
-            ))
-            logger.debug(f"Found USB printer: {name} ({printer_id})")
+            printers.append(_usb_printer_info(printer_id=printer_id, name=name))
+            logger.debug("Found USB printer: %s (%s)", name, printer_id)
 
     except Exception as e:
-        logger.error(f"USB discovery error: {e}")
+        logger.error("USB discovery error: %s", e)
 
     return printers
 
@@ -105,68 +166,179 @@ def discover_network(
     printers.extend(_discover_mdns())
 
     # Simple port scan on common subnet
-    if subnet_prefix is None:
-        subnet_prefix = _get_local_subnet()
+    local_ip = _get_local_ip()
+    if subnet_prefix is None and local_ip:
+        subnet_prefix = local_ip.rpartition('.')[0]
 
     if subnet_prefix:
-        for i in range(1, 255):
-            ip = f"{subnet_prefix}.{i}"
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(timeout)
-                result = sock.connect_ex((ip, port))
-                sock.close()
+        # Never probe this machine itself
+        hosts = [f"{subnet_prefix}.{i}" for i in range(1, 255)]
+        if local_ip in hosts:
+            hosts.remove(local_ip)
+        try:
+            open_hosts = _scan_open_port(hosts, port, timeout)
+        except OSError as e:
+            logger.error("Network scan error: %s", e)
+            open_hosts = []
 
-                if result == 0:
-                    printer_id = f"network:{ip}:{port}"
-                    # Check if already found via mDNS
-                    if not any(p['id'] == printer_id for p in printers):
-                        printers.append(printer_info(
-                            printer_id=printer_id,
-                            name=f"Network Printer ({ip})",
-                            printer_type='network',
-                            status='ready',
-                        ))
-                        logger.debug(f"Found network printer at {ip}:{port}")
-            except Exception:
+        known_ids = {p['id'] for p in printers}
+        for ip in open_hosts:
+            printer_id = f"network:{ip}:{port}"
+            # Check if already found via mDNS
+            if printer_id in known_ids:
                 continue
+            printers.append(printer_info(
+                printer_id=printer_id,
+                name=f"Network Printer ({ip})",
+                printer_type='network',
+                status='ready',
+            ))
+            logger.debug("Found network printer at %s:%s", ip, port)
 
     return printers
 
 
-def _discover_mdns() -> list[dict]:
-    """Discover printers via mDNS/Bonjour."""
-    printers = []
+def _scan_open_port(
+    hosts: list[str],
+    port: int,
+    timeout: float,
+    max_sockets: int = NETWORK_SCAN_MAX_SOCKETS,
+) -> list[str]:
+    """
+    Return the hosts (in input order) that accept a TCP connection on port.
+
+    Connects are issued non-blocking (at most max_sockets in flight) and
+    reaped with a selector, so a full /24 sweep takes a few timeouts instead
+    of one timeout per host. A host whose socket cannot be created or
+    connected (e.g. out of file descriptors) is skipped.
+    """
+    open_hosts = set()
+    pending = iter(hosts)
+    exhausted = False
 
+    selector = selectors.DefaultSelector()
     try:
-        from zeroconf import ServiceBrowser, Zeroconf, ServiceStateChange
-        import time
+        while True:
+            # Top up the in-flight window
+            while not exhausted and len(selector.get_map()) < max_sockets:
+                host = next(pending, None)
+                if host is None:
+                    exhausted = True
+                    break
+                try:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                except OSError as e:
+                    logger.debug("Skipping %s: %s", host, e)
+                    continue
+                try:
+                    sock.setblocking(False)
+                    result = sock.connect_ex((host, port))
+                except OSError as e:
+                    logger.debug("Skipping %s: %s", host, e)
+                    sock.close()
+                    continue
+                if result == 0:
+                    open_hosts.add(host)
+                    sock.close()
+                elif result in _CONNECT_IN_PROGRESS:
+                    deadline = time.monotonic() + timeout
+                    selector.register(sock, selectors.EVENT_WRITE, (host, deadline))
+                else:
+                    sock.close()
+
+            in_flight = selector.get_map()
+            if not in_flight:
+                break
+
+            now = time.monotonic()
+            next_deadline = min(key.data[1] for key in in_flight.values())
+            for key, _ in selector.select(timeout=max(0.0, next_deadline - now)):
+                sock = key.fileobj
+                # Writable means the handshake finished — SO_ERROR says how
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_hosts.add(key.data[0])
+                selector.unregister(sock)
+                sock.close()
+
+            # Give up on connects that outlived their timeout
+            now = time.monotonic()
+            for key in list(selector.get_map().values()):
+                if key.data[1] <= now:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+    finally:
+        # Closing the selector does not close the sockets registered with it
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+
+    return [host for host in hosts if host in open_hosts]
 
-        found = []
 
-        class Listener:
-            def add_service(self, zc, type_, name):
-                info = zc.get_service_info(type_, name)
-                if info:
-                    found.append(info)
+class _MdnsListener:
+    """Keeps _mdns_services in sync with what the shared browsers see."""
 
-            def remove_service(self, zc, type_, name):
-                pass
+    def add_service(self, zc, type_, name):
+        info = zc.get_service_info(type_, name)
+        if info:
+            _mdns_services[name] = info
+            _mdns_arrived.set()
 
-            def update_service(self, zc, type_, name):
-                pass
+    def update_service(self, zc, type_, name):
+        self.add_service(zc, type_, name)
+
+    def remove_service(self, zc, type_, name):
+        _mdns_services.pop(name, None)
+
+
+def _start_mdns() -> bool:
+    """Start the shared Zeroconf browsers once. Returns True if just started."""
+    global _mdns_zc
+
+    with _mdns_lock:
+        if _mdns_zc is not None:
+            return False
+
+        from zeroconf import ServiceBrowser, Zeroconf
 
         zc = Zeroconf()
-        listener = Listener()
+        listener = _MdnsListener()
+        for service_type in MDNS_SERVICE_TYPES:
+            _mdns_browsers.append(ServiceBrowser(zc, service_type, listener))
 
-        # Common printer service types
-        for service_type in ['_pdl-datastream._tcp.local.', '_ipp._tcp.local.']:
-            ServiceBrowser(zc, service_type, listener)
+        _mdns_zc = zc
+        atexit.register(zc.close)
+        return True
 
-        # Wait a bit for responses
-        time.sleep(1.5)
 
-        for info in found:
+def _discover_mdns() -> list[dict]:
+    """Discover printers via mDNS/Bonjour.
+
+    The Zeroconf instance and its browsers are shared and keep running in
+    the background, so after the first call this returns a snapshot of the
+    printers seen so far. On the first call it waits for answers: until no
+    new answer has arrived for MDNS_SETTLE_S, and never longer than
+    MDNS_TIMEOUT_S.
+    """
+    printers = []
+
+    try:
+        if _start_mdns():
+            # Wait for responses: until the first one, then until they go quiet
+            deadline = time.monotonic() + MDNS_TIMEOUT_S
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if _mdns_services:
+                    remaining = min(remaining, MDNS_SETTLE_S)
+                if not _mdns_arrived.wait(timeout=remaining):
+                    if _mdns_services:
+                        break  # Quiet for MDNS_SETTLE_S after answers came in
+                    continue
+                _mdns_arrived.clear()
+
+        for info in list(_mdns_services.values()):
             addresses = info.parsed_addresses()
             if not addresses:
                 continue
@@ -182,14 +354,12 @@ def _discover_mdns() -> list[dict]:
                 printer_type='network',
                 status='ready',
             ))
-            logger.debug(f"Found mDNS printer: {name} at {ip}:{port}")
-
-        zc.close()
+            logger.debug("Found mDNS printer: %s at %s:%s", name, ip, port)
 
     except ImportError:
         logger.debug("zeroconf not available — skipping mDNS discovery")
     except Exception as e:
-        logger.error(f"mDNS discovery error: {e}")
+        logger.error("mDNS discovery error: %s", e)
 
     return printers
 
@@ -200,16 +370,15 @@ def discover_bluetooth() -> list[dict]:
 
     # Try bleak (cross-platform BLE)
     try:
-        import asyncio
         from bleak import BleakScanner
 
         async def _scan():
-            devices = await BleakScanner.discover(timeout=3.0)
+            devices = await BleakScanner.discover(timeout=BLUETOOTH_SCAN_TIMEOUT_S)
             results = []
             for d in devices:
                 # Filter for printer-like devices
                 name = d.name or ''
-                if any(kw in name.lower() for kw in ['print', 'pos', 'thermal', 'escpos', 'star', 'epson', 'bixolon']):
+                if _BT_PRINTER_NAME_RE.search(name):
                     results.append(printer_info(
                         printer_id=f"bluetooth:{d.address}",
                         name=name,
@@ -218,39 +387,81 @@ def discover_bluetooth() -> list[dict]:
                     ))
             return results
 
+        # Run on the long-lived BLE loop so the loop and the platform
+        # Bluetooth backend are set up once, not on every discovery
+        future = asyncio.run_coroutine_threadsafe(_scan(), _get_bt_loop())
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Can't run nested event loop — skip BLE
-                pass
-            else:
-                printers = loop.run_until_complete(_scan())
-        except RuntimeError:
-            printers = asyncio.run(_scan())
+            printers = future.result(timeout=BLUETOOTH_SCAN_TIMEOUT_S + 2.0)
+        except concurrent.futures.TimeoutError:
+            # Stop the scan so it can't overlap the next discovery on the loop
+            future.cancel()
+            logger.warning("Bluetooth scan timed out")
 
     except ImportError:
         logger.debug("bleak not available — skipping Bluetooth discovery")
     except Exception as e:
-        logger.error(f"Bluetooth discovery error: {e}")
+        logger.error("Bluetooth discovery error: %s", e)
 
     return printers
 
 
-def _get_local_subnet() -> str | None:
-    """Get the local subnet prefix (e.g., '192.168.1')."""
+def _get_bt_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop used for BLE scans, starting it once."""
+    global _bt_loop
+
+    with _bt_loop_lock:
+        if _bt_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                daemon=True,
+                name='bluetooth-loop',
+            ).start()
+            _bt_loop = loop
+        return _bt_loop
+
+
+def _get_local_ip() -> str | None:
+    """Get this machine's IPv4 address on the default route.
+
+    Successful lookups are cached for LOCAL_IP_CACHE_TTL_S seconds.
+    """
+    global _local_ip_cache
+
+    now = time.monotonic()
+    if _local_ip_cache is not None and now - _local_ip_cache[0] < LOCAL_IP_CACHE_TTL_S:
+        return _local_ip_cache[1]
+
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(('8.8.8.8', 80))
-        ip = s.getsockname()[0]
-        s.close()
-        parts = ip.split('.')
-        return '.'.join(parts[:3])
+        # UDP connect sends nothing — it just selects the outgoing interface
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(('8.8.8.8', 80))
+            ip = s.getsockname()[0]
     except Exception:
         return None
 
+    _local_ip_cache = (now, ip)
+    return ip
+
+
+def _get_local_subnet() -> str | None:
+    """Get the local subnet prefix (e.g., '192.168.1')."""
+    ip = _get_local_ip()
+    return ip.rpartition('.')[0] if ip else None
+
 
 # ─── Printer Connection ─────────────────────────────────────────────────────
 
+# Printer ID grammar; exactly one alternative's groups are set on a match.
+# Network hosts never contain ':' (IPv6 literals go in brackets), so a bad
+# port can't be swallowed into the host.
+_PRINTER_ID_RE = re.compile(
+    r'usb:(?:0[xX])?(?P<vid>[0-9a-fA-F]+):(?:0[xX])?(?P<pid>[0-9a-fA-F]+)'
+    r'|network:(?:\[(?P<host6>[^\]]+)\]|(?P<host>[^:\[\]\s]+))(?::(?P<port>\d+))?'
+    r'|bluetooth:(?P<address>.+)'
+)
+
+
 def parse_printer_id(printer_id: str) -> tuple[str, dict]:
     """
     Parse a printer ID into type and connection parameters.
@@ -258,24 +469,29 @@ def parse_printer_id(printer_id: str) -> tuple[str, dict]:
     Examples:
         'usb:0x04b8:0x0202'    → ('usb', {'vendor_id': 0x04b8, 'product_id': 0x0202})
         'network:192.168.1.100:9100' → ('network', {'host': '192.168.1.100', 'port': 9100})
+        'network:[fe80::1]:9100' → ('network', {'host': 'fe80::1', 'port': 9100})
         'bluetooth:AA:BB:CC:DD:EE:FF' → ('bluetooth', {'address': 'AA:BB:CC:DD:EE:FF'})
+
+    Surrounding whitespace is ignored. Malformed IDs of a known type raise
+    ValueError rather than reaching connect_printer.
     """
-    parts = printer_id.split(':', 1)
-    ptype = parts[0]
-    rest = parts[1] if len(parts) > 1 else ''
+    printer_id = printer_id.strip()
+    match = _PRINTER_ID_RE.fullmatch(printer_id)
+    if match is None:
+        ptype = printer_id.partition(':')[0]
+        if ptype in ('usb', 'network', 'bluetooth'):
+            raise ValueError(f"Invalid {ptype} printer ID: {printer_id}")
+        raise ValueError(f"Unknown printer type: {ptype}")
 
-    if ptype == 'usb':
-        vid, pid = rest.split(':')
-        return 'usb', {'vendor_id': int(vid, 16), 'product_id': int(pid, 16)}
-    elif ptype == 'network':
-        host_port = rest.rsplit(':', 1)
-        host = host_port[0]
-        port = int(host_port[1]) if len(host_port) > 1 else ESCPOS_NETWORK_PORT
-        return 'network', {'host': host, 'port': port}
-    elif ptype == 'bluetooth':
-        return 'bluetooth', {'address': rest}
+    if match['vid'] is not None:
+        return 'usb', {'vendor_id': int(match['vid'], 16), 'product_id': int(match['pid'], 16)}
+    elif match['address'] is not None:
+        return 'bluetooth', {'address': match['address']}
     else:
-        raise ValueError(f"Unknown printer type: {ptype}")
+        port = int(match['port']) if match['port'] else ESCPOS_NETWORK_PORT
+        if not 0 < port < 65536:
+            raise ValueError(f"Invalid network printer ID: {printer_id}")
+        return 'network', {'host': match['host'] or match['host6'], 'port': port}
 
 
 def connect_printer(printer_id: str) -> Any:
@@ -6,6 +6,8 @@ The drawer is opened by sending an ESC/POS pulse command through the printer.
 """
 
 import logging
+from types import MappingProxyType
+from typing import Any
 
 from .discovery import connect_printer
 
@@ -18,21 +20,30 @@ logger = logging.getLogger('erplora.bridge.drawer')
 KICK_PIN_2 = b'\x1b\x70\x00\x19\x32'
 KICK_PIN_5 = b'\x1b\x70\x01\x19\x32'
 
+# Drawer pin -> kick command
+_KICK_COMMANDS = MappingProxyType({2: KICK_PIN_2, 5: KICK_PIN_5})
+
+
+def kick_drawer(printer: Any, pin: int = 2):
+    """Send the drawer kick pulse through an already open printer handle."""
+    printer._raw(_KICK_COMMANDS.get(pin, KICK_PIN_5))
+
 
 def open_drawer(printer_id: str, pin: int = 2):
     """
     Open the cash drawer connected to the specified printer.
 
+    Connects for this one kick; use PrinterManager.open_drawer to reuse the
+    pooled printer connection instead.
+
     Args:
         printer_id: Printer ID (e.g., 'usb:0x04b8:0x0202')
         pin: Drawer connector pin (2 or 5, default 2)
     """
-    command = KICK_PIN_2 if pin == 2 else KICK_PIN_5
-
     printer = connect_printer(printer_id)
     try:
-        printer._raw(command)
-        logger.info(f"Cash drawer opened via {printer_id} (pin {pin})")
+        kick_drawer(printer, pin)
+        logger.info("Cash drawer opened via %s (pin %s)", printer_id, pin)
     finally:
         try:
             printer.close()
@@ -6,27 +6,161 @@ to thermal printers via USB, network, or Bluetooth.
 """
 
 import logging
+import select
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterator
 
-from .discovery import parse_printer_id, connect_printer
+from ..protocol import to_json_bytes
+from .discovery import parse_printer_id, connect_printer, discover_all
+from .drawer import kick_drawer
 
 logger = logging.getLogger('erplora.bridge.printer')
 
+# How long discovery results are served from cache
+DISCOVERY_CACHE_TTL_S = 10.0
+
+# Pooled printer connections idle longer than this are closed. Kept below the
+# idle timeout many network printers apply to port 9100 connections.
+POOL_IDLE_TIMEOUT_S = 15.0
+
+# How often the reaper thread checks for idle connections
+POOL_REAP_INTERVAL_S = 5.0
+
+# A rendered document line: (printer.set() kwargs or None to keep the style, text)
+_Line = tuple[dict | None, str]
+
+# Prebuilt padding strings for right-aligning amounts on a 32-column line
+_PAD = [' ' * i for i in range(33)]
+
+# Styles shared by the per-item rows, built once so _emit can match them by
+# identity instead of comparing a fresh dict on every row. Never mutated.
+_ITEM_STYLE = {'align': 'left', 'bold': False}
+_KITCHEN_ITEM_STYLE = {'align': 'left', 'bold': True, 'double_height': True}
+_KITCHEN_NOTE_STYLE = {'align': 'left', 'bold': False, 'double_height': False}
+
+
+@dataclass
+class _PooledPrinter:
+    """An open printer handle plus the lock serializing jobs on it."""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    printer: Any = None
+    last_used: float = 0.0
+
+
+class BufferedEscPos:
+    """
+    Collects the ESC/POS output of a document and sends it in a single write.
+
+    Exposes the python-escpos printer API (set, text, cut, barcode, ...) by
+    rendering into an in-memory escpos Dummy printer that shares the target
+    printer's capability profile, so every command produces exactly the bytes
+    the real printer would have received — just without a write per call.
+    Without a target it only renders; take the bytes with flush_to_bytes().
+    """
+
+    def __init__(self, printer: Any = None):
+        from escpos.printer import Dummy
+
+        self._target = printer
+        self._buffer = Dummy()
+        profile = getattr(printer, 'profile', None)
+        if profile is not None:
+            self._buffer.profile = profile
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._buffer, name)
+
+    def flush_to_bytes(self) -> bytes:
+        """Return everything buffered so far and empty the buffer."""
+        data = self._buffer.output
+        self._buffer.clear()
+        return data
+
+    def flush(self):
+        """Write everything buffered so far to the printer in one call."""
+        data = self.flush_to_bytes()
+        if data:
+            _write_raw(self._target, data)
+
+
+def _peer_closed(printer: Any) -> bool:
+    """Return True if a pooled network handle's socket was closed remotely.
+
+    A write to a half-closed socket can still succeed, silently losing the
+    job, so the socket is polled before reuse: readable with nothing to
+    peek at means EOF. Non-network handles are never reported closed.
+    """
+    # _device, not the device property: the property reopens a closed handle
+    sock = getattr(printer, '_device', None)
+    if not isinstance(sock, socket.socket):
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b''
+    except (OSError, ValueError):  # ValueError: socket already closed (fd -1)
+        return True
+
+
+def _write_raw(printer: Any, data: bytes):
+    """Write raw bytes to an open printer handle."""
+    # escpos printers take raw bytes via _raw(); a plain serial port via write()
+    write = getattr(printer, '_raw', None) or printer.write
+    write(data)
+
 
 class PrinterManager:
-    """Manages multiple printers and routes print jobs."""
+    """Manages multiple printers and routes print jobs.
+
+    Printer connections are pooled per printer_id and reused across jobs;
+    each printer runs one job at a time.
+    """
 
     def __init__(self):
         self._cached_printers: list[dict] = []
+        self._cache_ts: float | None = None  # monotonic time of last discovery
+        self._cached_json = b'[]'  # _cached_printers, serialized once per update
+        self._rev = 0  # Bumped on every cache update
+        self._discover_lock = threading.Lock()
+        self._pool: dict[str, _PooledPrinter] = {}
+        self._pool_lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+        self._reaper_stop = threading.Event()
 
     def get_cached_printers(self) -> list[dict]:
         """Return the last discovered printers list."""
         return self._cached_printers
 
+    def get_cached_printers_json(self) -> bytes:
+        """Return the last discovered printers list as JSON bytes."""
+        return self._cached_json
+
+    @property
+    def cache_rev(self) -> int:
+        """Revision of the printers cache, for memoizing derived payloads."""
+        return self._rev
+
     def update_cache(self, printers: list[dict]):
         """Update the cached printers list after discovery."""
+        self._cached_json = to_json_bytes(printers)
         self._cached_printers = printers
+        self._cache_ts = time.monotonic()
+        self._rev += 1
+
+    def get_or_discover(self, ttl: float = DISCOVERY_CACHE_TTL_S, force: bool = False) -> list[dict]:
+        """Return the cached printers, re-running discovery if older than ttl.
+
+        Concurrent callers share a single discovery run.
+        """
+        with self._discover_lock:
+            fresh = self._cache_ts is not None and time.monotonic() - self._cache_ts < ttl
+            if force or not fresh:
+                self.update_cache(discover_all())
+            return self._cached_printers
 
     def print_document(self, printer_id: str, document_type: str, data: dict):
         """
@@ -37,33 +171,39 @@ class PrinterManager:
             document_type: Type of document ('receipt', 'kitchen_order', 'invoice', etc.)
             data: Document data from Hub
         """
-        printer = connect_printer(printer_id)
+        self.print_raw(printer_id, self.render_document(document_type, data))
 
-        try:
-            if document_type == 'receipt':
-                self._print_receipt(printer, data)
-            elif document_type == 'kitchen_order':
-                self._print_kitchen_order(printer, data)
-            elif document_type == 'invoice':
-                self._print_invoice(printer, data)
-            elif document_type == 'delivery_note':
-                self._print_delivery_note(printer, data)
-            elif document_type == 'barcode_label':
-                self._print_barcode_label(printer, data)
-            elif document_type == 'cash_session_report':
-                self._print_cash_report(printer, data)
-            else:
-                self._print_generic(printer, data)
-        finally:
-            try:
-                printer.close()
-            except Exception:
-                pass
+    def render_document(self, document_type: str, data: dict) -> bytes:
+        """
+        Render a document to ESC/POS bytes without touching any printer.
+
+        Lets the next job render while the current one is still printing.
+        """
+        printer = BufferedEscPos()
+        if document_type == 'receipt':
+            self._print_receipt(printer, data)
+        elif document_type == 'kitchen_order':
+            self._print_kitchen_order(printer, data)
+        elif document_type == 'invoice':
+            self._print_invoice(printer, data)
+        elif document_type == 'delivery_note':
+            self._print_delivery_note(printer, data)
+        elif document_type == 'barcode_label':
+            self._print_barcode_label(printer, data)
+        elif document_type == 'cash_session_report':
+            self._print_cash_report(printer, data)
+        else:
+            self._print_generic(printer, data)
+        return printer.flush_to_bytes()
+
+    def print_raw(self, printer_id: str, data: bytes):
+        """Send already rendered ESC/POS bytes to the printer in one write."""
+        self._run(printer_id, lambda connection: _write_raw(connection, data), "Print")
 
     def test_print(self, printer_id: str):
         """Print a test page to verify printer connectivity."""
-        printer = connect_printer(printer_id)
-        try:
+        def job(connection: Any):
+            printer = BufferedEscPos(connection)
             printer.set(align='center')
             printer.text("================================\n")
             printer.set(align='center', bold=True, double_height=True)
@@ -71,12 +211,107 @@ class PrinterManager:
             printer.set(align='center', bold=False, double_height=False)
             printer.text("--------------------------------\n")
             printer.text("Test Print OK\n")
-            printer.text(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            printer.text(f"{datetime.now():%Y-%m-%d %H:%M:%S}\n")
             printer.text("--------------------------------\n")
             printer.text(f"Printer: {printer_id}\n")
             printer.text("================================\n")
             printer.cut()
-        finally:
+            printer.flush()
+
+        self._run(printer_id, job, "Test print")
+
+    def open_drawer(self, printer_id: str, pin: int = 2):
+        """Open the cash drawer attached to a printer, over its pooled connection."""
+        self._run(printer_id, lambda printer: kick_drawer(printer, pin), "Drawer kick")
+
+    def close_all(self):
+        """Stop the idle reaper and close every pooled printer connection."""
+        self._reaper_stop.set()
+        with self._pool_lock:
+            entries = list(self._pool.values())
+            self._pool.clear()
+        for entry in entries:
+            with entry.lock:
+                self._close_entry(entry)
+
+    # ─── Connection Pool ─────────────────────────────────────────────────
+
+    def _run(self, printer_id: str, job: Callable[[Any], None], what: str):
+        """Run job(handle) on the pooled connection for printer_id.
+
+        A stale connection (printer rebooted, USB replugged, socket dropped)
+        fails with OSError: it is closed by _acquire and the job retried
+        once on a fresh connection.
+        """
+        try:
+            with self._acquire(printer_id) as printer:
+                job(printer)
+        except OSError as e:  # Includes usb.core.USBError
+            logger.warning("%s via %s failed (%s), reconnecting", what, printer_id, e)
+            with self._acquire(printer_id) as printer:
+                job(printer)
+
+    @contextmanager
+    def _acquire(self, printer_id: str) -> Iterator[Any]:
+        """Yield an open handle for printer_id, holding its job lock.
+
+        Connects on a miss. If the job raises, the handle is closed so the
+        next job starts on a fresh connection.
+        """
+        with self._pool_lock:
+            entry = self._pool.get(printer_id)
+            if entry is None:
+                entry = self._pool[printer_id] = _PooledPrinter()
+            self._start_reaper()
+
+        with entry.lock:
+            if entry.printer is not None and _peer_closed(entry.printer):
+                logger.debug("Pooled connection to %s was closed by the printer", printer_id)
+                self._close_entry(entry)
+            if entry.printer is None:
+                entry.printer = connect_printer(printer_id)
+            try:
+                yield entry.printer
+            except Exception:
+                self._close_entry(entry)
+                raise
+            finally:
+                entry.last_used = time.monotonic()
+
+    def _start_reaper(self):
+        """Start the idle-connection reaper thread. Must hold _pool_lock."""
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reap_loop,
+            daemon=True,
+            name='printer-pool-reaper',
+        )
+        self._reaper.start()
+
+    def _reap_loop(self):
+        """Periodically close connections idle for POOL_IDLE_TIMEOUT_S."""
+        while not self._reaper_stop.wait(POOL_REAP_INTERVAL_S):
+            with self._pool_lock:
+                entries = list(self._pool.items())
+            now = time.monotonic()
+            for printer_id, entry in entries:
+                # Skip printers that are busy with a job right now
+                if not entry.lock.acquire(blocking=False):
+                    continue
+                try:
+                    if entry.printer is not None and now - entry.last_used > POOL_IDLE_TIMEOUT_S:
+                        logger.debug("Closing idle connection to %s", printer_id)
+                        self._close_entry(entry)
+                finally:
+                    entry.lock.release()
+
+    @staticmethod
+    def _close_entry(entry: _PooledPrinter):
+        """Close a pooled handle, ignoring errors. Caller holds entry.lock."""
+        printer, entry.printer = entry.printer, None
+        if printer is not None:
             try:
                 printer.close()
             except Exception:
@@ -86,36 +321,43 @@ class PrinterManager:
 
     def _print_receipt(self, printer: Any, data: dict):
         """Render and print a sales receipt."""
+        self._emit(printer, self._render_receipt(data))
+        printer.cut()
+
+    def _render_receipt(self, data: dict) -> list[_Line]:
+        """Render a sales receipt into (style, text) lines."""
+        lines: list[_Line] = []
+
         # Header
-        printer.set(align='center', bold=True)
         business_name = data.get('business_name', 'ERPlora')
-        printer.text(f"{business_name}\n")
+        lines.append(({'align': 'center', 'bold': True}, f"{business_name}\n"))
 
         if data.get('business_address'):
-            printer.set(align='center', bold=False, text_type='normal')
-            printer.text(f"{data['business_address']}\n")
+            lines.append((
+                {'align': 'center', 'bold': False, 'text_type': 'normal'},
+                f"{data['business_address']}\n",
+            ))
 
         if data.get('vat_number'):
-            printer.text(f"NIF: {data['vat_number']}\n")
+            lines.append((None, f"NIF: {data['vat_number']}\n"))
 
         if data.get('phone'):
-            printer.text(f"Tel: {data['phone']}\n")
+            lines.append((None, f"Tel: {data['phone']}\n"))
 
-        printer.text("================================\n")
+        lines.append((None, "================================\n"))
 
         # Receipt info
-        printer.set(align='left', bold=False)
         receipt_id = data.get('receipt_id', '')
-        printer.text(f"Ticket: {receipt_id}\n")
-        printer.text(f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+        lines.append(({'align': 'left', 'bold': False}, f"Ticket: {receipt_id}\n"))
+        lines.append((None, f"Fecha: {datetime.now():%d/%m/%Y %H:%M}\n"))
 
         if data.get('cashier'):
-            printer.text(f"Cajero: {data['cashier']}\n")
+            lines.append((None, f"Cajero: {data['cashier']}\n"))
 
         if data.get('customer_name'):
-            printer.text(f"Cliente: {data['customer_name']}\n")
+            lines.append((None, f"Cliente: {data['customer_name']}\n"))
 
-        printer.text("--------------------------------\n")
+        lines.append((None, "--------------------------------\n"))
 
         # Items
         items = data.get('items', [])
@@ -124,91 +366,94 @@ class PrinterManager:
             qty = item.get('quantity', 1)
             total = item.get('total', 0)
 
-            # Line 1: quantity x name
-            printer.set(align='left', bold=False)
+            # Line 1: quantity x name, padded with the total on the right
             line = f"{qty}x {name}"
-            # Pad with spaces and add total on the right
             total_str = f"{total:.2f}"
-            padding = 32 - len(line) - len(total_str)
-            if padding < 1:
-                padding = 1
-            printer.text(f"{line}{' ' * padding}{total_str}\n")
+            padding = max(1, min(32, 32 - len(line) - len(total_str)))
+            lines.append((_ITEM_STYLE, f"{line}{_PAD[padding]}{total_str}\n"))
 
             # Notes if any
             if item.get('notes'):
-                printer.set(align='left', bold=False)
-                printer.text(f"  > {item['notes']}\n")
+                lines.append((_ITEM_STYLE, f"  > {item['notes']}\n"))
 
-        printer.text("--------------------------------\n")
+        lines.append((None, "--------------------------------\n"))
 
         # Totals
         if data.get('subtotal') is not None:
-            self._print_total_line(printer, "Subtotal", data['subtotal'])
+            lines.append((None, self._format_total_line("Subtotal", data['subtotal'])))
 
         if data.get('tax_amount') is not None:
             tax_label = data.get('tax_label', 'IVA')
-            self._print_total_line(printer, tax_label, data['tax_amount'])
+            lines.append((None, self._format_total_line(tax_label, data['tax_amount'])))
 
         if data.get('discount') is not None and data['discount'] > 0:
-            self._print_total_line(printer, "Descuento", -data['discount'])
+            lines.append((None, self._format_total_line("Descuento", -data['discount'])))
 
-        printer.text("================================\n")
-        printer.set(align='left', bold=True, double_height=True)
+        lines.append((None, "================================\n"))
         total = data.get('total', 0)
-        self._print_total_line(printer, "TOTAL", total)
-        printer.set(bold=False, double_height=False)
-        printer.text("================================\n")
+        lines.append((
+            {'align': 'left', 'bold': True, 'double_height': True},
+            self._format_total_line("TOTAL", total),
+        ))
+        lines.append(({'bold': False, 'double_height': False}, "================================\n"))
 
         # Payment info
         if data.get('payment_method'):
-            printer.set(align='left', bold=False)
-            printer.text(f"Pago: {data['payment_method']}\n")
+            lines.append(({'align': 'left', 'bold': False}, f"Pago: {data['payment_method']}\n"))
 
         if data.get('paid') is not None:
-            self._print_total_line(printer, "Entregado", data['paid'])
+            lines.append((None, self._format_total_line("Entregado", data['paid'])))
 
         if data.get('change') is not None and data['change'] > 0:
-            self._print_total_line(printer, "Cambio", data['change'])
+            lines.append((None, self._format_total_line("Cambio", data['change'])))
 
         # Footer
-        printer.text("\n")
+        lines.append((None, "\n"))
         if data.get('receipt_header'):
-            printer.set(align='center')
-            printer.text(f"{data['receipt_header']}\n")
+            lines.append(({'align': 'center'}, f"{data['receipt_header']}\n"))
 
         if data.get('receipt_footer'):
-            printer.set(align='center')
-            printer.text(f"{data['receipt_footer']}\n")
-
-        printer.set(align='center')
-        printer.text("\nGracias por su compra\n\n")
+            lines.append(({'align': 'center'}, f"{data['receipt_footer']}\n"))
 
-        printer.cut()
+        lines.append(({'align': 'center'}, "\nGracias por su compra\n\n"))
+        return lines
 
     def _print_kitchen_order(self, printer: Any, data: dict):
         """Render and print a kitchen order ticket (large text for readability)."""
+        self._emit(printer, self._render_kitchen_order(data))
+        printer.cut()
+
+    def _render_kitchen_order(self, data: dict) -> list[_Line]:
+        """Render a kitchen order ticket into (style, text) lines."""
+        lines: list[_Line] = []
+
         # Loud header for kitchen
-        printer.set(align='center', bold=True, double_height=True, double_width=True)
-        printer.text("COCINA\n")
+        lines.append((
+            {'align': 'center', 'bold': True, 'double_height': True, 'double_width': True},
+            "COCINA\n",
+        ))
 
-        printer.set(align='center', bold=True, double_height=True, double_width=False)
         order_number = data.get('receipt_id', data.get('order_number', ''))
-        printer.text(f"#{order_number}\n")
+        lines.append((
+            {'align': 'center', 'bold': True, 'double_height': True, 'double_width': False},
+            f"#{order_number}\n",
+        ))
 
-        printer.set(align='center', bold=False, double_height=False)
-        printer.text("================================\n")
+        lines.append((
+            {'align': 'center', 'bold': False, 'double_height': False},
+            "================================\n",
+        ))
 
         # Table and waiter
         if data.get('table'):
-            printer.set(align='left', bold=True, double_height=True)
-            printer.text(f"Mesa: {data['table']}\n")
+            lines.append(({'align': 'left', 'bold': True, 'double_height': True}, f"Mesa: {data['table']}\n"))
 
-        printer.set(align='left', bold=False, double_height=False)
+        lines.append(({'align': 'left', 'bold': False, 'double_height': False}, ""))
         if data.get('waiter'):
-            printer.text(f"Camarero: {data['waiter']}\n")
+            lines.append((None, f"Camarero: {data['waiter']}\n"))
 
-        printer.text(f"Hora: {datetime.now().strftime('%H:%M')}\n")
-        printer.text("--------------------------------\n")
+        lines.append((None, f"Hora: {datetime.now():%H:%M}\n"))
+        lines.append((None, "--------------------------------\n"))
 
         # Items — big text for kitchen readability
         items = data.get('items', [])
@@ -216,23 +461,20 @@ class PrinterManager:
             qty = item.get('quantity', 1)
             name = item.get('name', '')
 
-            printer.set(align='left', bold=True, double_height=True)
-            printer.text(f"{qty}x {name}\n")
+            lines.append((_KITCHEN_ITEM_STYLE, f"{qty}x {name}\n"))
 
             if item.get('notes'):
-                printer.set(align='left', bold=False, double_height=False)
-                printer.text(f"   >> {item['notes']}\n")
+                lines.append((_KITCHEN_NOTE_STYLE, f"   >> {item['notes']}\n"))
 
-        printer.text("================================\n")
+        lines.append((None, "================================\n"))
 
         # Priority
         priority = data.get('priority', 'NORMAL')
         if priority == 'HIGH':
-            printer.set(align='center', bold=True, double_height=True)
-            printer.text("!! URGENTE !!\n")
+            lines.append(({'align': 'center', 'bold': True, 'double_height': True}, "!! URGENTE !!\n"))
 
-        printer.text("\n")
-        printer.cut()
+        lines.append((None, "\n"))
+        return lines
 
     def _print_invoice(self, printer: Any, data: dict):
         """Render and print an invoice (similar to receipt with more detail)."""
@@ -241,30 +483,34 @@ class PrinterManager:
 
     def _print_delivery_note(self, printer: Any, data: dict):
         """Render and print a delivery note."""
-        printer.set(align='center', bold=True)
-        printer.text("ALBARAN\n")
-        printer.text("================================\n")
+        self._emit(printer, self._render_delivery_note(data))
+        printer.cut()
 
-        printer.set(align='left', bold=False)
-        printer.text(f"N: {data.get('receipt_id', '')}\n")
-        printer.text(f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+    def _render_delivery_note(self, data: dict) -> list[_Line]:
+        """Render a delivery note into (style, text) lines."""
+        lines: list[_Line] = [
+            ({'align': 'center', 'bold': True}, "ALBARAN\n"),
+            (None, "================================\n"),
+            ({'align': 'left', 'bold': False}, f"N: {data.get('receipt_id', '')}\n"),
+            (None, f"Fecha: {datetime.now():%d/%m/%Y %H:%M}\n"),
+        ]
 
         if data.get('customer_name'):
-            printer.text(f"Cliente: {data['customer_name']}\n")
+            lines.append((None, f"Cliente: {data['customer_name']}\n"))
         if data.get('delivery_address'):
-            printer.text(f"Dir: {data['delivery_address']}\n")
+            lines.append((None, f"Dir: {data['delivery_address']}\n"))
 
-        printer.text("--------------------------------\n")
+        lines.append((None, "--------------------------------\n"))
 
         items = data.get('items', [])
         for item in items:
             qty = item.get('quantity', 1)
             name = item.get('name', '')
-            printer.text(f"{qty}x {name}\n")
+            lines.append((None, f"{qty}x {name}\n"))
 
-        printer.text("================================\n")
-        printer.text("\nFirma: _______________\n\n")
-        printer.cut()
+        lines.append((None, "================================\n"))
+        lines.append((None, "\nFirma: _______________\n\n"))
+        return lines
 
     def _print_barcode_label(self, printer: Any, data: dict):
         """Print a barcode label."""
@@ -286,35 +532,39 @@ class PrinterManager:
 
     def _print_cash_report(self, printer: Any, data: dict):
         """Print a cash session report."""
-        printer.set(align='center', bold=True)
-        printer.text("CIERRE DE CAJA\n")
-        printer.text("================================\n")
+        self._emit(printer, self._render_cash_report(data))
+        printer.cut()
 
-        printer.set(align='left', bold=False)
-        printer.text(f"Sesion: {data.get('receipt_id', '')}\n")
-        printer.text(f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+    def _render_cash_report(self, data: dict) -> list[_Line]:
+        """Render a cash session report into (style, text) lines."""
+        lines: list[_Line] = [
+            ({'align': 'center', 'bold': True}, "CIERRE DE CAJA\n"),
+            (None, "================================\n"),
+            ({'align': 'left', 'bold': False}, f"Sesion: {data.get('receipt_id', '')}\n"),
+            (None, f"Fecha: {datetime.now():%d/%m/%Y %H:%M}\n"),
+        ]
 
         if data.get('cashier'):
-            printer.text(f"Cajero: {data['cashier']}\n")
+            lines.append((None, f"Cajero: {data['cashier']}\n"))
 
-        printer.text("--------------------------------\n")
+        lines.append((None, "--------------------------------\n"))
 
-        self._print_total_line(printer, "Apertura", data.get('opening_balance', 0))
-        self._print_total_line(printer, "Cierre", data.get('closing_balance', 0))
+        lines.append((None, self._format_total_line("Apertura", data.get('opening_balance', 0))))
+        lines.append((None, self._format_total_line("Cierre", data.get('closing_balance', 0))))
 
         diff = (data.get('closing_balance', 0) or 0) - (data.get('opening_balance', 0) or 0)
-        self._print_total_line(printer, "Diferencia", diff)
+        lines.append((None, self._format_total_line("Diferencia", diff)))
 
-        printer.text("--------------------------------\n")
+        lines.append((None, "--------------------------------\n"))
 
         transactions = data.get('transactions', [])
         for tx in transactions:
             label = tx.get('label', tx.get('type', ''))
             amount = tx.get('amount', 0)
-            self._print_total_line(printer, label, amount)
+            lines.append((None, self._format_total_line(label, amount)))
 
-        printer.text("================================\n\n")
-        printer.cut()
+        lines.append((None, "================================\n\n"))
+        return lines
 
     def _print_generic(self, printer: Any, data: dict):
         """Print a generic document with whatever data is provided."""
@@ -334,10 +584,30 @@ class PrinterManager:
     # ─── Helpers ─────────────────────────────────────────────────────────
 
     @staticmethod
-    def _print_total_line(printer: Any, label: str, amount: float):
-        """Print a right-aligned total line: 'Label         12.50'"""
+    def _emit(printer: Any, lines: list[_Line]):
+        """Print rendered lines, one set() + text() per run of same-style text.
+
+        A line with a style dict applies that style before its text; a line
+        with None continues in the current style. Re-applying the style just
+        set is skipped, so it doesn't split the block.
+        """
+        block: list[str] = []
+        current: dict | None = None
+        for style, text in lines:
+            if style is not None and style is not current and style != current:
+                if block:
+                    printer.text(''.join(block))
+                    block.clear()
+                printer.set(**style)
+                current = style
+            if text:
+                block.append(text)
+        if block:
+            printer.text(''.join(block))
+
+    @staticmethod
+    def _format_total_line(label: str, amount: float) -> str:
+        """Format a right-aligned total line: 'Label         12.50'"""
         amount_str = f"{amount:.2f}"
-        padding = 32 - len(label) - len(amount_str)
-        if padding < 1:
-            padding = 1
-        printer.text(f"{label}{' ' * padding}{amount_str}\n")
+        padding = max(1, min(32, 32 - len(label) - len(amount_str)))
+        return f"{label}{_PAD[padding]}{amount_str}\n"
@@ -11,12 +11,51 @@ when a barcode is detected.
 
 import logging
 import platform
+import queue
+import re
+import select
 import threading
 import time
 from typing import Callable
 
 logger = logging.getLogger('erplora.bridge.scanner')
 
+# Host OS, resolved once at import
+_SYSTEM = platform.system()
+
+# Input device names that look like a dedicated barcode scanner
+_SCANNER_NAME_RE = re.compile(r'scanner|barcode|reader|hid', re.IGNORECASE)
+
+
+def _build_evdev_scancodes() -> tuple[str, ...]:
+    """Build a scancode -> character table indexed by evdev key code."""
+    table = [''] * 256
+    # Digit row: KEY_1 (2) .. KEY_9 (10), KEY_0 (11)
+    for code, char in zip(range(2, 12), '1234567890'):
+        table[code] = char
+    # Letter rows (QWERTY layout), matching the Windows A-Z handling
+    for start, row in ((16, 'QWERTYUIOP'), (30, 'ASDFGHJKL'), (44, 'ZXCVBNM')):
+        for offset, char in enumerate(row):
+            table[start + offset] = char
+    table[28] = '\n'  # KEY_ENTER
+    table[96] = '\n'  # KEY_KPENTER
+    return tuple(table)
+
+
+# evdev key code -> character, indexed directly by event.code
+_EVDEV_SCANCODES = _build_evdev_scancodes()
+
+# All-digit barcode types by length
+_NUMERIC_BARCODE_TYPES = {
+    13: 'EAN13',
+    8: 'EAN8',
+    12: 'UPC-A',
+    14: 'GTIN-14',
+}
+
+# Valid CODE39 character set
+_CODE39_CHARS = b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-. $/+%'
+
 
 class ScannerManager:
     """
@@ -38,11 +77,15 @@ class ScannerManager:
             timeout_ms: Max time between keystrokes to be considered a scan
         """
         self._callback = callback
-        self._timeout = timeout_ms / 1000.0  # Convert to seconds
+        self._timeout_ns = timeout_ms * 1_000_000  # Convert to nanoseconds
         self._thread: threading.Thread | None = None
         self._running = False
-        self._buffer = ''
-        self._last_keystroke_time = 0.0
+        self._buffer = bytearray()
+        self._last_keystroke_time = 0
+        self._hook_thread_id: int | None = None  # Windows message-pump thread
+        # Completed scans, handed from the input thread to the dispatcher
+        self._scans: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._dispatcher: threading.Thread | None = None
 
     @property
     def is_running(self) -> bool:
@@ -53,58 +96,81 @@ class ScannerManager:
         if self._running:
             return
 
-        system = platform.system()
+        starters = {
+            'Darwin': self._start_macos,
+            'Linux': self._start_linux,
+            'Windows': self._start_windows,
+        }
+        starter = starters.get(_SYSTEM)
+        if starter is None:
+            logger.warning("Scanner not supported on %s", _SYSTEM)
+            return
 
-        if system == 'Darwin':
-            self._start_macos()
-        elif system == 'Linux':
-            self._start_linux()
-        elif system == 'Windows':
-            self._start_windows()
-        else:
-            logger.warning(f"Scanner not supported on {system}")
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop,
+            daemon=True,
+            name='scanner-dispatch',
+        )
+        self._dispatcher.start()
+        starter()
 
     def stop(self):
         """Stop the scanner listener."""
         self._running = False
+        if self._hook_thread_id is not None:
+            # Wake the blocking GetMessageW pump so the hook thread can exit
+            import ctypes
+            WM_QUIT = 0x0012
+            ctypes.windll.user32.PostThreadMessageW(self._hook_thread_id, WM_QUIT, 0, 0)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
+        if self._dispatcher and self._dispatcher.is_alive():
+            self._scans.put(None)  # Sentinel: stop after draining queued scans
+            self._dispatcher.join(timeout=2.0)
 
     def _on_char(self, char: str):
         """Process a character from the scanner input."""
-        now = time.time()
+        now = time.monotonic_ns()
 
         # If too much time passed since last char, reset buffer
-        if self._buffer and (now - self._last_keystroke_time) > self._timeout:
-            self._buffer = ''
+        if self._buffer and (now - self._last_keystroke_time) > self._timeout_ns:
+            del self._buffer[:]
 
         self._last_keystroke_time = now
 
         if char in ('\n', '\r'):
             # End of scan — process buffer
             if len(self._buffer) >= 4:  # Minimum barcode length
-                barcode = self._buffer.strip()
-                barcode_type = self._detect_barcode_type(barcode)
-                logger.info(f"Barcode scanned: {barcode} ({barcode_type})")
-                self._callback(barcode, barcode_type)
-            self._buffer = ''
+                # Hand off so a slow callback never delays the next scan
+                self._scans.put(bytes(self._buffer))
+            del self._buffer[:]
         else:
-            self._buffer += char
+            self._buffer.append(ord(char))
+
+    def _dispatch_loop(self):
+        """Decode queued scans and invoke the callback, off the input thread."""
+        while True:
+            raw = self._scans.get()
+            if raw is None:
+                break
+            barcode = raw.decode('ascii', 'ignore').strip()
+            barcode_type = self._detect_barcode_type(barcode)
+            logger.info("Barcode scanned: %s (%s)", barcode, barcode_type)
+            try:
+                self._callback(barcode, barcode_type)
+            except Exception as e:
+                logger.error("Barcode callback error: %s", e)
 
     @staticmethod
     def _detect_barcode_type(value: str) -> str:
         """Guess the barcode type from the value."""
+        length = len(value)
         if value.isdigit():
-            length = len(value)
-            if length == 13:
-                return 'EAN13'
-            elif length == 8:
-                return 'EAN8'
-            elif length == 12:
-                return 'UPC-A'
-            elif length == 14:
-                return 'GTIN-14'
-        if len(value) <= 43 and all(c in '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-. $/+%' for c in value.upper()):
+            numeric_type = _NUMERIC_BARCODE_TYPES.get(length)
+            if numeric_type:
+                return numeric_type
+        # Deleting every valid CODE39 byte leaves nothing if the value is CODE39
+        if length <= 43 and not value.upper().encode('ascii', 'replace').translate(None, _CODE39_CHARS):
             return 'CODE39'
         return 'CODE128'  # Default assumption
 
@@ -147,8 +213,7 @@ class ScannerManager:
             scanner_device = None
 
             for dev in devices:
-                name_lower = dev.name.lower()
-                if any(kw in name_lower for kw in ['scanner', 'barcode', 'reader', 'hid']):
+                if _SCANNER_NAME_RE.search(dev.name):
                     scanner_device = dev
                     break
 
@@ -156,21 +221,28 @@ class ScannerManager:
                 logger.info("No dedicated scanner device found (scanners may work via keyboard)")
                 return
 
-            logger.info(f"Listening on scanner device: {scanner_device.name}")
-
-            scancodes = {
-                2: '1', 3: '2', 4: '3', 5: '4', 6: '5',
-                7: '6', 8: '7', 9: '8', 10: '9', 11: '0',
-                28: '\n',
-            }
-
-            for event in scanner_device.read_loop():
-                if not self._running:
+            logger.info("Listening on scanner device: %s", scanner_device.name)
+
+            while self._running:
+                # Block until events are pending, then drain the whole batch
+                # with a single read() instead of one syscall per event.
+                ready, _, _ = select.select([scanner_device.fd], [], [], 1.0)
+                if not ready:
+                    continue
+                try:
+                    # read() is a generator; list() performs the syscall here
+                    events = list(scanner_device.read())
+                except BlockingIOError:
+                    continue
+                except OSError as e:
+                    logger.error("Scanner device read error: %s", e)
                     break
-                if event.type == 1 and event.value == 1:  # KEY_DOWN
-                    char = scancodes.get(event.code, '')
-                    if char:
-                        self._on_char(char)
+
+                for event in events:
+                    if event.type == 1 and event.value == 1:  # KEY_DOWN
+                        char = _EVDEV_SCANCODES[event.code] if event.code < 256 else ''
+                        if char:
+                            self._on_char(char)
 
         self._thread = threading.Thread(target=_read_evdev, daemon=True, name='scanner-evdev')
         self._thread.start()
@@ -210,18 +282,21 @@ class ScannerManager:
                     return user32.CallNextHookEx(None, nCode, wParam, lParam)
 
                 hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, low_level_handler, None, 0)
+                self._hook_thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
 
+                # GetMessageW blocks until a message arrives and returns 0 on
+                # WM_QUIT (posted by stop()), so there is no polling delay.
                 msg = wintypes.MSG()
-                while self._running:
-                    if user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, 1):
+                try:
+                    while self._running and user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
                         user32.TranslateMessage(ctypes.byref(msg))
                         user32.DispatchMessageW(ctypes.byref(msg))
-                    time.sleep(0.01)
-
-                user32.UnhookWindowsHookEx(hook)
+                finally:
+                    self._hook_thread_id = None
+                    user32.UnhookWindowsHookEx(hook)
 
             except Exception as e:
-                logger.error(f"Windows keyboard hook error: {e}")
+                logger.error("Windows keyboard hook error: %s", e)
 
         self._thread = threading.Thread(target=_keyboard_hook, daemon=True, name='scanner-kbhook')
         self._thread.start()
@@ -5,10 +5,36 @@ All messages are JSON objects with either an 'action' key (Hub -> Bridge)
 or an 'event' key (Bridge -> Hub).
 """
 
+from collections import deque
 from dataclasses import dataclass, field, asdict
 from typing import Any
+import base64
+import binascii
 import json
-import uuid
+import secrets
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # Not available on every platform (e.g. Android builds)
+    # json.dumps() builds a new JSONEncoder whenever non-default options are
+    # passed; keep a single compact encoder instead.
+    _encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def _dumps(obj: Any) -> bytes:
+        return _encode(obj).encode()
+
+    _loads = json.loads
+
+try:
+    import msgpack
+except ImportError:  # Optional: binary (msgpack) command frames are disabled
+    msgpack = None
+
+# Whether this bridge accepts msgpack-encoded commands in binary frames
+BINARY_COMMANDS = msgpack is not None
 
 
 # ─── Hub → Bridge (Commands) ────────────────────────────────────────────────
@@ -27,66 +53,94 @@ ACTIONS = {
 def make_command(action: str, **kwargs) -> str:
     """Create a JSON command string to send to the bridge."""
     msg = {'action': action, **kwargs}
-    return json.dumps(msg)
+    return _dumps(msg).decode()
 
 
 # ─── Bridge → Hub (Events) ──────────────────────────────────────────────────
-
-def status_event(version: str, printers: list, scanner_active: bool = False) -> str:
-    return json.dumps({
-        'event': 'status',
-        'version': version,
-        'printers': printers,
-        'scanner': scanner_active,
-    })
-
-
-def printers_event(printers: list) -> str:
-    return json.dumps({
-        'event': 'printers',
-        'printers': printers,
-    })
-
-
-def print_complete_event(job_id: str) -> str:
-    return json.dumps({
+#
+# Events are returned as UTF-8 encoded JSON bytes, ready to be sent as-is in
+# a binary WebSocket frame to any number of clients without re-encoding.
+
+# Events that embed the printers list are built from templates so a list that
+# was serialized once (PrinterManager.get_cached_printers_json) is spliced in
+# as-is instead of being re-encoded for every client.
+_STATUS_TEMPLATE = b'{"event":"status","version":%s,"printers":%s,"scanner":%s,"binary":%s}'
+_PRINTERS_TEMPLATE = b'{"event":"printers","printers":%s}'
+
+
+def to_json_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON, with the same encoder as events."""
+    return _dumps(obj)
+
+
+def status_event(
+    version: str,
+    printers: list | bytes,
+    scanner_active: bool = False,
+    binary: bool = False,
+) -> bytes:
+    """``printers`` may be a list or that list already serialized to JSON."""
+    if not isinstance(printers, bytes):
+        printers = _dumps(printers)
+    return _STATUS_TEMPLATE % (
+        _dumps(version),
+        printers,
+        b'true' if scanner_active else b'false',
+        b'true' if binary else b'false',
+    )
+
+
+def printers_event(printers: list | bytes) -> bytes:
+    """``printers`` may be a list or that list already serialized to JSON."""
+    if not isinstance(printers, bytes):
+        printers = _dumps(printers)
+    return _PRINTERS_TEMPLATE % printers
+
+
+def print_complete_event(job_id: str) -> bytes:
+    return _dumps({
         'event': 'print_complete',
         'job_id': job_id,
     })
 
 
-def print_error_event(job_id: str, error: str) -> str:
-    return json.dumps({
+def print_error_event(job_id: str, error: str) -> bytes:
+    return _dumps({
         'event': 'print_error',
         'job_id': job_id,
         'error': error,
     })
 
 
-def drawer_opened_event(printer_id: str) -> str:
-    return json.dumps({
+def drawer_opened_event(printer_id: str) -> bytes:
+    return _dumps({
         'event': 'drawer_opened',
         'printer_id': printer_id,
     })
 
 
-def barcode_event(value: str, barcode_type: str = 'unknown') -> str:
-    return json.dumps({
+def barcode_event(value: str, barcode_type: str = 'unknown') -> bytes:
+    return _dumps({
         'event': 'barcode',
         'value': value,
         'type': barcode_type,
     })
 
 
-def keyboard_toggled_event(visible: bool) -> str:
-    return json.dumps({
+def keyboard_toggled_event(visible: bool) -> bytes:
+    return _dumps({
         'event': 'keyboard_toggled',
         'visible': visible,
     })
 
 
-def error_event(message: str, code: str = 'unknown') -> str:
-    return json.dumps({
+def batch_event(events: list[bytes]) -> bytes:
+    """Wrap already-serialized events in one envelope, in order."""
+    return b'{"event":"batch","events":[' + b','.join(events) + b']}'
+
+
+def error_event(message: str, code: str = 'unknown') -> bytes:
+    return _dumps({
         'event': 'error',
         'message': message,
         'code': code,
@@ -95,15 +149,49 @@ def error_event(message: str, code: str = 'unknown') -> str:
 
 # ─── Parsing ────────────────────────────────────────────────────────────────
 
-def parse_message(raw: str) -> dict:
+def parse_message(raw: str | bytes) -> dict:
     """Parse an incoming JSON message. Returns dict or raises ValueError."""
     try:
-        msg = json.loads(raw)
+        msg = _loads(raw)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON: {e}")
 
+    return _check_message(msg, "a JSON object")
+
+
+_JSON_WHITESPACE = b' \t\r\n'
+
+
+def _starts_json_object(raw: bytes) -> bool:
+    """Whether the first non-whitespace byte of ``raw`` is '{' (no copy)."""
+    for byte in raw:
+        if byte not in _JSON_WHITESPACE:
+            return byte == 0x7b
+    return False
+
+
+def parse_binary_message(raw: bytes) -> dict:
+    """Parse a message from a binary frame. Returns dict or raises ValueError.
+
+    msgpack maps are decoded with binary fields (e.g. a print command's
+    ``raw``) as bytes, with no base64 layer. UTF-8 JSON, the format events
+    are sent in, is accepted too: always when msgpack is not installed, and
+    otherwise when the frame starts with '{' (a msgpack map never does).
+    """
+    if msgpack is None or _starts_json_object(raw):
+        return parse_message(raw)
+    try:
+        msg = msgpack.unpackb(raw, raw=False)
+    except Exception as e:  # msgpack raises several unrelated error types
+        raise ValueError(f"Invalid msgpack: {str(e) or type(e).__name__}")
+
+    return _check_message(msg, "a msgpack map")
+
+
+def _check_message(msg: Any, expected: str) -> dict:
+    """Validate the shape of a decoded message."""
     if not isinstance(msg, dict):
-        raise ValueError("Message must be a JSON object")
+        raise ValueError(f"Message must be {expected}")
 
     if 'action' not in msg and 'event' not in msg:
         raise ValueError("Message must have 'action' or 'event' key")
@@ -111,9 +199,37 @@ def parse_message(raw: str) -> dict:
     return msg
 
 
+def decode_raw_payload(raw: str | bytes) -> bytes:
+    """Decode the ``raw`` field of a print command to ESC/POS bytes.
+
+    JSON commands carry it base64-encoded; msgpack commands as bytes.
+    An empty payload is an error, not a request for a rendered document.
+    """
+    if isinstance(raw, bytes):
+        data = raw
+    else:
+        try:
+            data = base64.b64decode(raw, validate=True)
+        except (binascii.Error, TypeError) as e:
+            raise ValueError(f"Invalid raw payload: {e}")
+    if not data:
+        raise ValueError("Invalid raw payload: empty")
+    return data
+
+
+# Job IDs are drawn from one urandom read per batch rather than one per ID
+JOB_ID_BATCH = 256
+_job_ids: deque[str] = deque()
+
+
 def generate_job_id() -> str:
-    """Generate a unique job ID for print jobs."""
-    return str(uuid.uuid4())
+    """Generate a unique job ID for print jobs (16 hex chars, opaque)."""
+    try:
+        return _job_ids.popleft()
+    except IndexError:
+        blob = secrets.token_hex(8 * JOB_ID_BATCH)
+        _job_ids.extend(blob[i:i + 16] for i in range(0, len(blob), 16))
+        return _job_ids.popleft()
 
 
 # ─── Printer info dict helper ───────────────────────────────────────────────
@@ -6,8 +6,15 @@ with local hardware (printers, cash drawer, barcode scanner).
 """
 
 import asyncio
+import base64
 import json
 import logging
+import os
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Set
 
@@ -18,6 +25,8 @@ from . import __version__
 from .config import BridgeConfig
 from .protocol import (
     parse_message,
+    decode_raw_payload,
+    barcode_event,
     status_event,
     printers_event,
     print_complete_event,
@@ -28,48 +37,86 @@ from .protocol import (
     generate_job_id,
 )
 from .hardware.printer import PrinterManager
-from .hardware.discovery import discover_all
-from .hardware.drawer import open_drawer
 from .hardware.scanner import ScannerManager
 
 logger = logging.getLogger('erplora.bridge')
 
+_SYSTEM = platform.system()
+
 # Active WebSocket connections
 connections: Set[WebSocket] = set()
 
+# Clients that cannot take a broadcast within this time are dropped
+SEND_TIMEOUT_S = 2.0
+_closing_tasks: set[asyncio.Task] = set()  # Keeps close tasks referenced until done
+
+# Per-printer FIFO print queues, each drained by its own worker task
+PRINT_QUEUE_MAXSIZE = 32
+RENDER_AHEAD = 2  # Jobs rendered ahead of the one currently printing
+WORKER_IDLE_TIMEOUT_S = 60.0  # Idle workers (and their threads) are torn down
+job_queues: dict[str, asyncio.Queue] = {}
+worker_tasks: dict[str, asyncio.Task] = {}
+
 # Global instances
 config = BridgeConfig()
 printer_manager = PrinterManager()
 scanner_manager: ScannerManager | None = None
+event_loop: asyncio.AbstractEventLoop | None = None  # Server loop, set on startup
 
 
-async def broadcast(message: str):
-    """Send a message to all connected clients."""
-    disconnected = set()
-    for ws in connections:
-        try:
-            await ws.send_text(message)
-        except Exception:
-            disconnected.add(ws)
-    connections.difference_update(disconnected)
+async def _safe_send(ws: WebSocket, message: bytes) -> WebSocket | None:
+    """Send to one client; return the socket if it failed or stalled."""
+    try:
+        await asyncio.wait_for(ws.send_bytes(message), SEND_TIMEOUT_S)
+        return None
+    except Exception:
+        return ws
+
+
+async def broadcast(message: bytes):
+    """Send a message to all connected clients concurrently.
+
+    Iterates over a snapshot: clients may connect or disconnect (and other
+    broadcasts may run) while the sends are awaited. The shared set is only
+    touched once, after every send has finished.
+    """
+    targets = tuple(connections)
+    failed = await asyncio.gather(*(_safe_send(ws, message) for ws in targets))
+    disconnected = {ws for ws in failed if ws is not None}
+    if disconnected:
+        connections.difference_update(disconnected)
+        # Close them too: a client left open but unsubscribed would silently
+        # miss every later broadcast; closed, it reconnects
+        for ws in disconnected:
+            task = asyncio.create_task(_close_quietly(ws))
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+
+
+async def _close_quietly(ws: WebSocket):
+    """Close a client socket after a failed broadcast, ignoring errors."""
+    try:
+        await asyncio.wait_for(ws.close(code=1011), SEND_TIMEOUT_S)
+    except Exception:
+        pass
 
 
 def on_barcode_scanned(value: str, barcode_type: str = 'unknown'):
     """Callback when barcode scanner detects a scan."""
-    from .protocol import barcode_event
     msg = barcode_event(value, barcode_type)
-    # Schedule broadcast in the event loop
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        asyncio.ensure_future(broadcast(msg))
+    # Called from the scanner thread — hand the broadcast to the server loop
+    if event_loop is not None and event_loop.is_running():
+        asyncio.run_coroutine_threadsafe(broadcast(msg), event_loop)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown logic."""
-    global scanner_manager
+    global scanner_manager, event_loop
+
+    event_loop = asyncio.get_running_loop()
 
-    logger.info(f"ERPlora Bridge v{__version__} starting on {config.host}:{config.port}")
+    logger.info("ERPlora Bridge v%s starting on %s:%s", __version__, config.host, config.port)
 
     # Start barcode scanner listener if enabled
     if config.scanner_enabled:
@@ -87,6 +134,15 @@ async def lifespan(app: FastAPI):
         scanner_manager.stop()
         logger.info("Barcode scanner listener stopped")
 
+    for task in worker_tasks.values():
+        task.cancel()
+    await asyncio.gather(*worker_tasks.values(), return_exceptions=True)
+    worker_tasks.clear()
+    job_queues.clear()
+
+    printer_manager.close_all()
+    _close_ps_helper()
+
     logger.info("ERPlora Bridge shutting down")
 
 
@@ -122,13 +178,12 @@ async def websocket_endpoint(ws: WebSocket):
     """Main WebSocket endpoint for Hub <-> Bridge communication."""
     await ws.accept()
     connections.add(ws)
-    logger.info(f"Client connected (total: {len(connections)})")
+    logger.info("Client connected (total: %s)", len(connections))
 
     # Send initial status
-    printers = printer_manager.get_cached_printers()
-    await ws.send_text(status_event(
+    await ws.send_bytes(status_event(
         version=__version__,
-        printers=printers,
+        printers=printer_manager.get_cached_printers_json(),
         scanner_active=scanner_manager is not None and scanner_manager.is_running,
     ))
 
@@ -139,10 +194,10 @@ async def websocket_endpoint(ws: WebSocket):
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         connections.discard(ws)
-        logger.info(f"Client disconnected (total: {len(connections)})")
+        logger.info("Client disconnected (total: %s)", len(connections))
 
 
 async def handle_message(ws: WebSocket, raw: str):
@@ -150,82 +205,158 @@ async def handle_message(ws: WebSocket, raw: str):
     try:
         msg = parse_message(raw)
     except ValueError as e:
-        await ws.send_text(error_event(str(e), 'parse_error'))
+        await ws.send_bytes(error_event(str(e), 'parse_error'))
         return
 
     action = msg.get('action')
-    logger.debug(f"Action: {action}")
-
-    if action == 'get_status':
-        await handle_get_status(ws)
-    elif action == 'discover_printers':
-        await handle_discover_printers(ws)
-    elif action == 'print':
-        await handle_print(ws, msg)
-    elif action == 'open_drawer':
-        await handle_open_drawer(ws, msg)
-    elif action == 'test_print':
-        await handle_test_print(ws, msg)
-    elif action == 'send_notification':
-        await handle_send_notification(ws, msg)
-    elif action == 'toggle_keyboard':
-        await handle_toggle_keyboard(ws, msg)
+    logger.debug("Action: %s", action)
+
+    handler = DISPATCH.get(action)
+    if handler is not None:
+        await handler(ws, msg)
     else:
-        await ws.send_text(error_event(f"Unknown action: {action}", 'unknown_action'))
+        await ws.send_bytes(error_event(f"Unknown action: {action}", 'unknown_action'))
 
 
 async def handle_get_status(ws: WebSocket):
     """Handle get_status command."""
-    printers = printer_manager.get_cached_printers()
-    await ws.send_text(status_event(
+    await ws.send_bytes(status_event(
         version=__version__,
-        printers=printers,
+        printers=printer_manager.get_cached_printers_json(),
         scanner_active=scanner_manager is not None and scanner_manager.is_running,
     ))
 
 
-async def handle_discover_printers(ws: WebSocket):
-    """Handle discover_printers command — scans for all available hardware."""
-    logger.info("Discovering printers...")
+async def handle_discover_printers(ws: WebSocket, msg: dict):
+    """Handle discover_printers command — scans for all available hardware.
 
-    # Run discovery in thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    printers = await loop.run_in_executor(None, discover_all)
+    Results are cached briefly; send "refresh": true to force a new scan.
+    """
+    logger.info("Discovering printers...")
 
-    # Update printer manager cache
-    printer_manager.update_cache(printers)
+    # Run discovery in a worker thread to avoid blocking
+    printers = await asyncio.to_thread(
+        printer_manager.get_or_discover,
+        force=bool(msg.get('refresh')),
+    )
 
-    await ws.send_text(printers_event(printers))
-    logger.info(f"Found {len(printers)} printer(s)")
+    await ws.send_bytes(printers_event(printer_manager.get_cached_printers_json()))
+    logger.info("Found %s printer(s)", len(printers))
 
 
 async def handle_print(ws: WebSocket, msg: dict):
-    """Handle print command."""
+    """Handle print command — queues the job on the printer's worker.
+
+    A ``raw`` field (base64 ESC/POS rendered by the Hub) is written to the
+    printer as-is; ``document_type`` and ``data`` are then ignored.
+    """
     printer_id = msg.get('printer_id')
     data = msg.get('data', {})
     job_id = msg.get('job_id') or generate_job_id()
     document_type = msg.get('document_type', 'receipt')
 
     if not printer_id:
-        await ws.send_text(print_error_event(job_id, 'No printer_id specified'))
+        await ws.send_bytes(print_error_event(job_id, 'No printer_id specified'))
         return
 
-    # Run print job in thread pool
-    loop = asyncio.get_event_loop()
-    try:
-        await loop.run_in_executor(
-            None,
-            printer_manager.print_document,
-            printer_id,
-            document_type,
-            data,
+    raw = None
+    if 'raw' in msg:
+        try:
+            raw = decode_raw_payload(msg['raw'])
+        except ValueError as e:
+            await ws.send_bytes(print_error_event(job_id, str(e)))
+            return
+
+    queue = job_queues.get(printer_id)
+    if queue is None:
+        queue = job_queues[printer_id] = asyncio.Queue(maxsize=PRINT_QUEUE_MAXSIZE)
+        worker_tasks[printer_id] = asyncio.create_task(
+            _printer_worker(printer_id, queue),
+            name=f'print-worker:{printer_id}',
         )
-        await ws.send_text(print_complete_event(job_id))
-        logger.info(f"Print job {job_id} completed on {printer_id}")
-    except Exception as e:
-        error_msg = str(e)
-        await ws.send_text(print_error_event(job_id, error_msg))
-        logger.error(f"Print job {job_id} failed: {error_msg}")
+
+    await queue.put((ws, job_id, document_type, data, raw))
+
+
+async def _printer_worker(printer_id: str, queue: asyncio.Queue):
+    """Run queued print jobs for one printer, strictly in FIFO order.
+
+    Rendering and sending are pipelined: while job N is being written to
+    the printer, job N+1 is already rendering to ESC/POS bytes.
+
+    After WORKER_IDLE_TIMEOUT_S without a new job the worker unregisters
+    itself and exits, so stale or mistyped printer IDs don't keep tasks
+    and threads alive; the next job for that printer starts a new worker.
+    """
+    loop = asyncio.get_running_loop()
+    render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'render-{printer_id}')
+    send_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'print-{printer_id}')
+    rendered: asyncio.Queue = asyncio.Queue(maxsize=RENDER_AHEAD)
+
+    async def render_loop():
+        while True:
+            try:
+                job = await asyncio.wait_for(queue.get(), WORKER_IDLE_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                # No await between this check and unregistering, so
+                # handle_print can't slip a job into a queue nobody drains
+                if queue.empty():
+                    if job_queues.get(printer_id) is queue:
+                        del job_queues[printer_id]
+                        del worker_tasks[printer_id]
+                    await rendered.put(None)  # Let send_loop finish first
+                    return
+                continue
+
+            ws, job_id, document_type, data, raw = job
+            try:
+                payload = raw if raw is not None else await loop.run_in_executor(
+                    render_executor,
+                    printer_manager.render_document,
+                    document_type,
+                    data,
+                )
+                await rendered.put((ws, job_id, payload, None))
+            except Exception as e:
+                await rendered.put((ws, job_id, None, e))
+            finally:
+                queue.task_done()
+
+    async def send_loop():
+        while True:
+            item = await rendered.get()
+            if item is None:
+                return
+            ws, job_id, payload, error = item
+            if error is None:
+                try:
+                    await loop.run_in_executor(
+                        send_executor,
+                        printer_manager.print_raw,
+                        printer_id,
+                        payload,
+                    )
+                except Exception as e:
+                    error = e
+
+            if error is None:
+                reply = print_complete_event(job_id)
+                logger.info("Print job %s completed on %s", job_id, printer_id)
+            else:
+                error_msg = str(error)
+                reply = print_error_event(job_id, error_msg)
+                logger.error("Print job %s failed: %s", job_id, error_msg)
+
+            try:
+                await ws.send_bytes(reply)
+            except Exception:
+                pass  # Client went away while its job was printing
+
+    try:
+        await asyncio.gather(render_loop(), send_loop())
+    finally:
+        render_executor.shutdown(wait=False)
+        send_executor.shutdown(wait=False)
 
 
 async def handle_open_drawer(ws: WebSocket, msg: dict):
@@ -233,17 +364,16 @@ async def handle_open_drawer(ws: WebSocket, msg: dict):
     printer_id = msg.get('printer_id')
 
     if not printer_id:
-        await ws.send_text(error_event('No printer_id specified', 'missing_param'))
+        await ws.send_bytes(error_event('No printer_id specified', 'missing_param'))
         return
 
-    loop = asyncio.get_event_loop()
     try:
-        await loop.run_in_executor(None, open_drawer, printer_id)
-        await ws.send_text(drawer_opened_event(printer_id))
-        logger.info(f"Cash drawer opened via {printer_id}")
+        await asyncio.to_thread(printer_manager.open_drawer, printer_id)
+        await ws.send_bytes(drawer_opened_event(printer_id))
+        logger.info("Cash drawer opened via %s", printer_id)
     except Exception as e:
-        await ws.send_text(error_event(f"Drawer error: {e}", 'drawer_error'))
-        logger.error(f"Drawer error: {e}")
+        await ws.send_bytes(error_event(f"Drawer error: {e}", 'drawer_error'))
+        logger.error("Drawer error: %s", e)
 
 
 async def handle_test_print(ws: WebSocket, msg: dict):
@@ -252,21 +382,16 @@ async def handle_test_print(ws: WebSocket, msg: dict):
     job_id = generate_job_id()
 
     if not printer_id:
-        await ws.send_text(print_error_event(job_id, 'No printer_id specified'))
+        await ws.send_bytes(print_error_event(job_id, 'No printer_id specified'))
         return
 
-    loop = asyncio.get_event_loop()
     try:
-        await loop.run_in_executor(
-            None,
-            printer_manager.test_print,
-            printer_id,
-        )
-        await ws.send_text(print_complete_event(job_id))
-        logger.info(f"Test print completed on {printer_id}")
+        await asyncio.to_thread(printer_manager.test_print, printer_id)
+        await ws.send_bytes(print_complete_event(job_id))
+        logger.info("Test print completed on %s", printer_id)
     except Exception as e:
-        await ws.send_text(print_error_event(job_id, str(e)))
-        logger.error(f"Test print failed: {e}")
+        await ws.send_bytes(print_error_event(job_id, str(e)))
+        logger.error("Test print failed: %s", e)
 
 
 async def handle_send_notification(ws: WebSocket, msg: dict):
@@ -274,34 +399,93 @@ async def handle_send_notification(ws: WebSocket, msg: dict):
     title = msg.get('title', 'ERPlora')
     body = msg.get('body', '')
 
-    loop = asyncio.get_event_loop()
     try:
-        await loop.run_in_executor(None, _show_notification, title, body)
-        logger.info(f"Notification sent: {title}")
+        await asyncio.to_thread(_show_notification, title, body)
+        logger.info("Notification sent: %s", title)
     except Exception as e:
-        await ws.send_text(error_event(f"Notification error: {e}", 'notification_error'))
-        logger.error(f"Notification error: {e}")
+        await ws.send_bytes(error_event(f"Notification error: {e}", 'notification_error'))
+        logger.error("Notification error: %s", e)
+
+
+# Long-lived PowerShell process for Windows notifications (see _ps_notify)
+_PS_PREAMBLE = (
+    '[System.Reflection.Assembly]::LoadWithPartialName("System.Windows.Forms") | Out-Null; '
+    '$n = New-Object System.Windows.Forms.NotifyIcon; '
+    '$n.Icon = [System.Drawing.SystemIcons]::Information; '
+    '$n.Visible = $true\n'
+)
+_ps_proc: subprocess.Popen | None = None
+_ps_lock = threading.Lock()
+
+
+def _ps_text(value: str) -> str:
+    """PowerShell expression evaluating to ``value`` (ASCII-only, no quoting)."""
+    encoded = base64.b64encode(value.encode('utf-8')).decode('ascii')
+    return f"[Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}'))"
+
+
+def _ps_notify(title: str, body: str):
+    """Show a balloon tip through the shared PowerShell helper.
+
+    Spawning powershell.exe and loading WinForms costs close to a second,
+    so one process is kept alive and fed one command line per notification.
+    A helper that has exited is replaced on the next call.
+    """
+    global _ps_proc
+    line = f"$n.ShowBalloonTip(5000, {_ps_text(title)}, {_ps_text(body)}, 'Info')\n"
+
+    with _ps_lock:
+        for attempt in range(2):
+            if _ps_proc is None or _ps_proc.poll() is not None:
+                _ps_proc = subprocess.Popen(
+                    ['powershell', '-NoProfile', '-NoLogo', '-Command', '-'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                )
+                _ps_proc.stdin.write(_PS_PREAMBLE)
+            try:
+                _ps_proc.stdin.write(line)
+                _ps_proc.stdin.flush()
+                return
+            except OSError:
+                _ps_proc = None
+                if attempt:
+                    raise
+
+
+def _close_ps_helper():
+    """Dispose of the notification icon and stop the PowerShell helper."""
+    global _ps_proc
+    with _ps_lock:
+        proc, _ps_proc = _ps_proc, None
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        proc.stdin.write('$n.Dispose(); exit\n')
+        proc.stdin.close()
+        proc.wait(timeout=2)
+    except (OSError, subprocess.TimeoutExpired):
+        proc.kill()
 
 
 def _show_notification(title: str, body: str):
-    """Show an OS-level notification (platform-specific)."""
-    import platform
-    import subprocess
-    system = platform.system()
-
-    if system == 'Darwin':
-        script = f'display notification "{body}" with title "{title}"'
-        subprocess.run(['osascript', '-e', script], check=True, capture_output=True)
-    elif system == 'Windows':
-        ps_cmd = (
-            f'[System.Reflection.Assembly]::LoadWithPartialName("System.Windows.Forms") | Out-Null; '
-            f'$n = New-Object System.Windows.Forms.NotifyIcon; '
-            f'$n.Icon = [System.Drawing.SystemIcons]::Information; '
-            f'$n.Visible = $true; '
-            f'$n.ShowBalloonTip(5000, "{title}", "{body}", "Info"); '
-            f'Start-Sleep -Seconds 6; $n.Dispose()'
+    """Show an OS-level notification (platform-specific).
+
+    Title and body are never spliced into a shell-parsed string: they go
+    through argv on macOS/Linux and base64-encoded to the PowerShell helper
+    on Windows, so quotes in user text cannot break the command.
+    """
+    if _SYSTEM == 'Darwin':
+        script = (
+            'on run argv\n'
+            'display notification (item 1 of argv) with title (item 2 of argv)\n'
+            'end run'
         )
-        subprocess.run(['powershell', '-Command', ps_cmd], check=True, capture_output=True)
+        subprocess.run(['osascript', '-e', script, body, title], check=True, capture_output=True)
+    elif _SYSTEM == 'Windows':
+        _ps_notify(title, body)
     else:
         # Linux: notify-send
         subprocess.run(['notify-send', title, body], check=True, capture_output=True)
@@ -311,33 +495,26 @@ async def handle_toggle_keyboard(ws: WebSocket, msg: dict):
     """Handle toggle_keyboard command — opens/closes OS virtual keyboard."""
     visible = msg.get('visible', True)
 
-    loop = asyncio.get_event_loop()
     try:
-        await loop.run_in_executor(None, _toggle_keyboard, visible)
-        await ws.send_text(keyboard_toggled_event(visible))
-        logger.info(f"Keyboard toggled: visible={visible}")
+        await asyncio.to_thread(_toggle_keyboard, visible)
+        await ws.send_bytes(keyboard_toggled_event(visible))
+        logger.info("Keyboard toggled: visible=%s", visible)
     except Exception as e:
-        await ws.send_text(error_event(f"Keyboard error: {e}", 'keyboard_error'))
-        logger.error(f"Keyboard toggle error: {e}")
+        await ws.send_bytes(error_event(f"Keyboard error: {e}", 'keyboard_error'))
+        logger.error("Keyboard toggle error: %s", e)
 
 
 def _toggle_keyboard(visible: bool):
     """Toggle the OS virtual keyboard (platform-specific)."""
-    import platform
-    import subprocess
-    system = platform.system()
-
-    if system == 'Windows':
+    if _SYSTEM == 'Windows':
         if visible:
             # Kill existing instances first (TabTip stays in background on Win11)
             subprocess.run(
                 ['taskkill', '/IM', 'TabTip.exe', '/F'],
                 capture_output=True,
             )
-            import time
             time.sleep(0.3)
             # Launch modern touch keyboard
-            import os
             tabtip = os.path.join(
                 os.environ.get('ProgramFiles', r'C:\Program Files'),
                 'Common Files', 'microsoft shared', 'ink', 'TabTip.exe',
@@ -352,7 +529,7 @@ def _toggle_keyboard(visible: bool):
             subprocess.run(['taskkill', '/IM', 'TabTip.exe', '/F'], capture_output=True)
             subprocess.run(['taskkill', '/IM', 'osk.exe', '/F'], capture_output=True)
 
-    elif system == 'Darwin':
+    elif _SYSTEM == 'Darwin':
         raise RuntimeError("Virtual keyboard not supported on macOS (no touchscreen)")
 
     else:
@@ -361,3 +538,15 @@ def _toggle_keyboard(visible: bool):
             subprocess.Popen(['onboard'])
         else:
             subprocess.run(['pkill', 'onboard'], capture_output=True)
+
+
+# Action name -> handler(ws, msg); keys mirror protocol.ACTIONS
+DISPATCH = {
+    'get_status': lambda ws, msg: handle_get_status(ws),
+    'discover_printers': handle_discover_printers,
+    'print': handle_print,
+    'open_drawer': handle_open_drawer,
+    'test_print': handle_test_print,
+    'send_notification': handle_send_notification,
+    'toggle_keyboard': handle_toggle_keyboard,
+}
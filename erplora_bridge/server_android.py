@@ -9,17 +9,24 @@ dependencies suitable for python-for-android.
 """
 
 import asyncio
-import json
+import functools
 import logging
-from typing import Set
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakSet
 
 import websockets
+from websockets import broadcast as ws_broadcast
 from websockets.server import serve
 
 from . import __version__
 from .config import BridgeConfig
 from .protocol import (
     parse_message,
+    parse_binary_message,
+    BINARY_COMMANDS,
+    decode_raw_payload,
     status_event,
     printers_event,
     print_complete_event,
@@ -27,158 +34,236 @@ from .protocol import (
     drawer_opened_event,
     keyboard_toggled_event,
     error_event,
+    batch_event,
     generate_job_id,
 )
 from .hardware.printer import PrinterManager
-from .hardware.discovery import discover_all
-from .hardware.drawer import open_drawer
 
 logger = logging.getLogger('erplora.bridge')
 
-connections: Set = set()
+# Clients are browsers on the same device: deflate only costs CPU here
+WS_COMPRESSION = None
+WS_MAX_SIZE = 2 * 1024 * 1024  # Leaves room for base64 'raw' print payloads
+
+# One small pool for all blocking hardware calls; the default executor
+# sizes itself from the CPU count, which is oversized for a phone
+HARDWARE_WORKERS = 4
+_EXECUTOR = ThreadPoolExecutor(max_workers=HARDWARE_WORKERS, thread_name_prefix='bridge-hw')
+
+# Weak so a handler that dies without reaching discard() cannot pin a socket
+connections: WeakSet = WeakSet()
+_pending: list[bytes] = []  # Broadcasts waiting for the next flush
+_flush_scheduled = False
 config = BridgeConfig()
 printer_manager = PrinterManager()
 
+# (printers cache revision, scanner_active) -> serialized status event
+_status_cache: tuple[tuple[int, bool], bytes] | None = None
 
-async def broadcast(message: str):
-    """Send a message to all connected clients."""
-    disconnected = set()
-    for ws in connections:
-        try:
-            await ws.send(message)
-        except Exception:
-            disconnected.add(ws)
-    connections.difference_update(disconnected)
+
+def status_event_cached(scanner_active: bool = False) -> bytes:
+    """Return the status event, re-serializing only when its inputs change."""
+    global _status_cache
+    key = (printer_manager.cache_rev, scanner_active)
+    if _status_cache is None or _status_cache[0] != key:
+        _status_cache = (key, status_event(
+            version=__version__,
+            printers=printer_manager.get_cached_printers_json(),
+            scanner_active=scanner_active,
+            binary=BINARY_COMMANDS,
+        ))
+    return _status_cache[1]
+
+
+def broadcast(message: bytes):
+    """Queue a message for all connected clients.
+
+    Messages broadcast within the same event-loop tick are flushed together
+    as a single frame (see _flush_broadcasts), so a burst of events costs
+    one write per client instead of one per event.
+    """
+    global _flush_scheduled
+    _pending.append(message)
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        asyncio.get_running_loop().call_soon(_flush_broadcasts)
+
+
+def _flush_broadcasts():
+    """Send the queued broadcasts; a lone message goes out verbatim."""
+    global _flush_scheduled
+    _flush_scheduled = False
+    pending = _pending[:]
+    _pending.clear()
+    if not pending:
+        return
+    payload = pending[0] if len(pending) == 1 else batch_event(pending)
+    # websockets.broadcast encodes the frame once and writes it to every
+    # open connection without waiting; closed clients are skipped
+    ws_broadcast(connections, payload)
 
 
 async def handle_client(websocket):
     """Handle a single WebSocket client connection."""
     connections.add(websocket)
-    logger.info(f"Client connected (total: {len(connections)})")
+    logger.info("Client connected (total: %s)", len(connections))
 
     # Send initial status
-    printers = printer_manager.get_cached_printers()
-    await websocket.send(status_event(
-        version=__version__,
-        printers=printers,
-        scanner_active=False,
-    ))
+    await websocket.send(status_event_cached())
 
+    loop = asyncio.get_running_loop()
     try:
         async for raw in websocket:
-            await handle_message(websocket, raw)
+            await handle_message(websocket, raw, loop)
     except websockets.ConnectionClosed:
         pass
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         connections.discard(websocket)
-        logger.info(f"Client disconnected (total: {len(connections)})")
+        logger.info("Client disconnected (total: %s)", len(connections))
+
 
+async def handle_message(ws, raw: str | bytes, loop: asyncio.AbstractEventLoop):
+    """Route incoming messages to the appropriate handler.
 
-async def handle_message(ws, raw: str):
-    """Route incoming messages to the appropriate handler."""
+    Text frames carry JSON; binary frames carry msgpack (advertised to the
+    client via the status event's ``binary`` flag).
+    """
     try:
-        msg = parse_message(raw)
+        msg = parse_binary_message(raw) if isinstance(raw, bytes) else parse_message(raw)
     except ValueError as e:
         await ws.send(error_event(str(e), 'parse_error'))
         return
 
     action = msg.get('action')
-    logger.debug(f"Action: {action}")
+    logger.debug("Action: %s", action)
+
+    handler = _HANDLERS.get(action)
+    if handler is not None:
+        await handler(ws, msg, loop)
+    else:
+        await ws.send(error_event(f"Unknown action: {action}", 'unknown_action'))
+
+
+async def _h_get_status(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle get_status — reply with the (memoized) status event."""
+    await ws.send(status_event_cached())
 
-    if action == 'get_status':
-        printers = printer_manager.get_cached_printers()
-        await ws.send(status_event(
-            version=__version__,
-            printers=printers,
-            scanner_active=False,
-        ))
 
-    elif action == 'discover_printers':
-        logger.info("Discovering printers...")
-        loop = asyncio.get_event_loop()
-        printers = await loop.run_in_executor(None, discover_all)
-        printer_manager.update_cache(printers)
-        await ws.send(printers_event(printers))
-        logger.info(f"Found {len(printers)} printer(s)")
-
-    elif action == 'print':
-        printer_id = msg.get('printer_id')
-        data = msg.get('data', {})
-        job_id = msg.get('job_id') or generate_job_id()
-        document_type = msg.get('document_type', 'receipt')
-
-        if not printer_id:
-            await ws.send(print_error_event(job_id, 'No printer_id specified'))
-            return
-
-        loop = asyncio.get_event_loop()
-        try:
+async def _h_discover_printers(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle discover_printers — scan for printers ("refresh": true skips the cache)."""
+    logger.info("Discovering printers...")
+    printers = await loop.run_in_executor(
+        _EXECUTOR,
+        functools.partial(printer_manager.get_or_discover, force=bool(msg.get('refresh'))),
+    )
+    await ws.send(printers_event(printer_manager.get_cached_printers_json()))
+    logger.info("Found %s printer(s)", len(printers))
+
+
+async def _h_print(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle print — render and print a document, or write a pre-rendered ``raw`` payload."""
+    printer_id = msg.get('printer_id')
+    data = msg.get('data', {})
+    job_id = msg.get('job_id') or generate_job_id()
+    document_type = msg.get('document_type', 'receipt')
+
+    if not printer_id:
+        await ws.send(print_error_event(job_id, 'No printer_id specified'))
+        return
+
+    try:
+        if 'raw' in msg:
             await loop.run_in_executor(
-                None, printer_manager.print_document, printer_id, document_type, data,
+                _EXECUTOR, printer_manager.print_raw, printer_id, decode_raw_payload(msg['raw']),
             )
-            await ws.send(print_complete_event(job_id))
-        except Exception as e:
-            await ws.send(print_error_event(job_id, str(e)))
-
-    elif action == 'open_drawer':
-        printer_id = msg.get('printer_id')
-        if not printer_id:
-            await ws.send(error_event('No printer_id specified', 'missing_param'))
-            return
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(None, open_drawer, printer_id)
-            await ws.send(drawer_opened_event(printer_id))
-        except Exception as e:
-            await ws.send(error_event(f"Drawer error: {e}", 'drawer_error'))
-
-    elif action == 'test_print':
-        printer_id = msg.get('printer_id')
-        job_id = generate_job_id()
-        if not printer_id:
-            await ws.send(print_error_event(job_id, 'No printer_id specified'))
-            return
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(None, printer_manager.test_print, printer_id)
-            await ws.send(print_complete_event(job_id))
-        except Exception as e:
-            await ws.send(print_error_event(job_id, str(e)))
-
-    elif action == 'send_notification':
-        title = msg.get('title', 'ERPlora')
-        body = msg.get('body', '')
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(None, _show_notification_android, title, body)
-            logger.info(f"Notification sent: {title}")
-        except Exception as e:
-            await ws.send(error_event(f"Notification error: {e}", 'notification_error'))
-            logger.error(f"Notification error: {e}")
-
-    elif action == 'toggle_keyboard':
-        visible = msg.get('visible', True)
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(None, _toggle_keyboard_android, visible)
-            await ws.send(keyboard_toggled_event(visible))
-            logger.info(f"Keyboard toggled: visible={visible}")
-        except Exception as e:
-            await ws.send(error_event(f"Keyboard error: {e}", 'keyboard_error'))
-            logger.error(f"Keyboard toggle error: {e}")
+        else:
+            await loop.run_in_executor(
+                _EXECUTOR, printer_manager.print_document, printer_id, document_type, data,
+            )
+        await ws.send(print_complete_event(job_id))
+    except Exception as e:
+        await ws.send(print_error_event(job_id, str(e)))
 
-    else:
-        await ws.send(error_event(f"Unknown action: {action}", 'unknown_action'))
+
+async def _h_open_drawer(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle open_drawer — kick the cash drawer attached to a printer."""
+    printer_id = msg.get('printer_id')
+    if not printer_id:
+        await ws.send(error_event('No printer_id specified', 'missing_param'))
+        return
+    try:
+        await loop.run_in_executor(_EXECUTOR, printer_manager.open_drawer, printer_id)
+        await ws.send(drawer_opened_event(printer_id))
+    except Exception as e:
+        await ws.send(error_event(f"Drawer error: {e}", 'drawer_error'))
+
+
+async def _h_test_print(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle test_print — print a short test page."""
+    printer_id = msg.get('printer_id')
+    job_id = generate_job_id()
+    if not printer_id:
+        await ws.send(print_error_event(job_id, 'No printer_id specified'))
+        return
+    try:
+        await loop.run_in_executor(_EXECUTOR, printer_manager.test_print, printer_id)
+        await ws.send(print_complete_event(job_id))
+    except Exception as e:
+        await ws.send(print_error_event(job_id, str(e)))
+
+
+async def _h_send_notification(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle send_notification — show an Android notification."""
+    title = msg.get('title', 'ERPlora')
+    body = msg.get('body', '')
+    try:
+        await loop.run_in_executor(_EXECUTOR, _show_notification_android, title, body)
+        logger.info("Notification sent: %s", title)
+    except Exception as e:
+        await ws.send(error_event(f"Notification error: {e}", 'notification_error'))
+        logger.error("Notification error: %s", e)
+
+
+async def _h_toggle_keyboard(ws, msg: dict, loop: asyncio.AbstractEventLoop):
+    """Handle toggle_keyboard — show or hide the soft keyboard."""
+    visible = msg.get('visible', True)
+    try:
+        await loop.run_in_executor(_EXECUTOR, _toggle_keyboard_android, visible)
+        await ws.send(keyboard_toggled_event(visible))
+        logger.info("Keyboard toggled: visible=%s", visible)
+    except Exception as e:
+        await ws.send(error_event(f"Keyboard error: {e}", 'keyboard_error'))
+        logger.error("Keyboard toggle error: %s", e)
+
+
+# Action name -> handler(ws, msg, loop); keys mirror protocol.ACTIONS
+_HANDLERS = {
+    'get_status': _h_get_status,
+    'discover_printers': _h_discover_printers,
+    'print': _h_print,
+    'open_drawer': _h_open_drawer,
+    'test_print': _h_test_print,
+    'send_notification': _h_send_notification,
+    'toggle_keyboard': _h_toggle_keyboard,
+}
 
 
 async def run_server(host: str = '0.0.0.0', port: int = 12321):
     """Start the WebSocket server."""
-    logger.info(f"ERPlora Bridge v{__version__} (Android) on {host}:{port}")
+    logger.info("ERPlora Bridge v%s (Android) on %s:%s", __version__, host, port)
 
-    async with serve(handle_client, host, port):
-        await asyncio.Future()  # Run forever
+    try:
+        async with serve(
+            handle_client, host, port,
+            compression=WS_COMPRESSION,
+            max_size=WS_MAX_SIZE,
+        ):
+            await asyncio.Future()  # Run forever
+    finally:
+        printer_manager.close_all()
+        _EXECUTOR.shutdown(wait=False)
 
 
 def main():
@@ -191,67 +276,104 @@ def main():
 
     port = config.port
     # On Android, bind to 0.0.0.0 so the browser on the same device can connect
-    asyncio.run(run_server('0.0.0.0', port))
+    _get_runner()(run_server('0.0.0.0', port))
+
+
+def _get_runner():
+    """Return uvloop.run where uvloop is usable, else asyncio.run.
+
+    python-for-android builds do not ship uvloop; this module is also run
+    on desktop for testing, where uvloop is normally installed.
+    """
+    if sys.platform == 'android' or 'ANDROID_ARGUMENT' in os.environ:
+        return asyncio.run
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run
+    logger.info("Using uvloop event loop")
+    return uvloop.run
 
 
 def _show_notification_android(title: str, body: str):
     """Show an Android notification via pyjnius."""
+    global _channel_created, _app_icon
     try:
-        from jnius import autoclass
-
-        PythonActivity = autoclass('org.kivy.android.PythonActivity')
-        Context = autoclass('android.content.Context')
-        NotificationBuilder = autoclass('android.app.Notification$Builder')
-        NotificationManager = autoclass('android.app.NotificationManager')
-
-        activity = PythonActivity.mActivity
-        manager = activity.getSystemService(Context.NOTIFICATION_SERVICE)
-
-        # Android 8+ requires a notification channel
-        if autoclass('android.os.Build$VERSION').SDK_INT >= 26:
-            NotificationChannel = autoclass('android.app.NotificationChannel')
-            channel = NotificationChannel(
-                'erplora_bridge', 'ERPlora Bridge',
-                NotificationManager.IMPORTANCE_DEFAULT
-            )
-            manager.createNotificationChannel(channel)
-            builder = NotificationBuilder(activity, 'erplora_bridge')
+        if _PythonActivity is None:
+            raise RuntimeError("pyjnius is not available")
+
+        activity = _PythonActivity.mActivity
+        manager = activity.getSystemService(_NOTIFICATION_SERVICE)
+
+        # Android 8+ requires a notification channel (created once per process)
+        if _SDK_INT >= 26:
+            if not _channel_created:
+                channel = _NotificationChannel(
+                    'erplora_bridge', 'ERPlora Bridge',
+                    _IMPORTANCE_DEFAULT
+                )
+                manager.createNotificationChannel(channel)
+                _channel_created = True
+            builder = _NotificationBuilder(activity, 'erplora_bridge')
         else:
-            builder = NotificationBuilder(activity)
+            builder = _NotificationBuilder(activity)
 
         builder.setContentTitle(title)
         builder.setContentText(body)
-        builder.setSmallIcon(activity.getApplicationInfo().icon)
+        if _app_icon is None:
+            _app_icon = activity.getApplicationInfo().icon
+        builder.setSmallIcon(_app_icon)
         builder.setAutoCancel(True)
 
         manager.notify(1, builder.build())
     except Exception as e:
-        logger.error(f"Android notification failed: {e}")
+        logger.error("Android notification failed: %s", e)
         raise
 
 
 def _toggle_keyboard_android(visible: bool):
     """Toggle the Android soft keyboard via pyjnius."""
     try:
-        from jnius import autoclass
+        if _PythonActivity is None:
+            raise RuntimeError("pyjnius is not available")
 
-        PythonActivity = autoclass('org.kivy.android.PythonActivity')
-        Context = autoclass('android.content.Context')
-        InputMethodManager = autoclass('android.view.inputmethod.InputMethodManager')
-
-        activity = PythonActivity.mActivity
-        imm = activity.getSystemService(Context.INPUT_METHOD_SERVICE)
+        activity = _PythonActivity.mActivity
+        imm = activity.getSystemService(_INPUT_METHOD_SERVICE)
 
         if visible:
-            imm.toggleSoftInput(InputMethodManager.SHOW_FORCED, 0)
+            imm.toggleSoftInput(_SHOW_FORCED, 0)
         else:
             view = activity.getCurrentFocus()
             if view:
                 imm.hideSoftInputFromWindow(view.getWindowToken(), 0)
     except Exception as e:
-        logger.error(f"Android keyboard toggle failed: {e}")
+        logger.error("Android keyboard toggle failed: %s", e)
         raise
 
 
+# Java classes and the constants read from them are resolved once: each
+# autoclass() call and static field read crosses JNI. Off Android (no
+# pyjnius) the helpers above raise instead.
+_channel_created = False
+_app_icon: int | None = None  # Resource id of the app icon, read on first use
+try:
+    from jnius import autoclass
+
+    _PythonActivity = autoclass('org.kivy.android.PythonActivity')
+    _Context = autoclass('android.content.Context')
+    _NotificationBuilder = autoclass('android.app.Notification$Builder')
+    _NotificationManager = autoclass('android.app.NotificationManager')
+    _InputMethodManager = autoclass('android.view.inputmethod.InputMethodManager')
+    _SDK_INT = autoclass('android.os.Build$VERSION').SDK_INT
+    _NotificationChannel = autoclass('android.app.NotificationChannel') if _SDK_INT >= 26 else None
+
+    _NOTIFICATION_SERVICE = _Context.NOTIFICATION_SERVICE
+    _INPUT_METHOD_SERVICE = _Context.INPUT_METHOD_SERVICE
+    _IMPORTANCE_DEFAULT = _NotificationManager.IMPORTANCE_DEFAULT
+    _SHOW_FORCED = _InputMethodManager.SHOW_FORCED
+except Exception:
+    _PythonActivity = None
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,60 @@
+"""Tests for printer ID parsing in erplora_bridge.hardware.discovery."""
+
+import pytest
+
+from erplora_bridge.hardware.discovery import parse_printer_id
+
+
+VALID_IDS = [
+    # USB: hex vendor/product, with or without 0x
+    ('usb:0x04b8:0x0202', ('usb', {'vendor_id': 0x04b8, 'product_id': 0x0202})),
+    ('usb:04b8:0202', ('usb', {'vendor_id': 0x04b8, 'product_id': 0x0202})),
+    ('usb:0X0FE6:0x811E', ('usb', {'vendor_id': 0x0fe6, 'product_id': 0x811e})),
+    ('usb:0x04b8:0x0202 ', ('usb', {'vendor_id': 0x04b8, 'product_id': 0x0202})),
+    # Network: IPv4, hostname, bracketed IPv6; port defaults to 9100
+    ('network:192.168.1.100:9100', ('network', {'host': '192.168.1.100', 'port': 9100})),
+    ('network:192.168.1.100', ('network', {'host': '192.168.1.100', 'port': 9100})),
+    ('network:printer.local:9101', ('network', {'host': 'printer.local', 'port': 9101})),
+    ('network:[fe80::1]:9100', ('network', {'host': 'fe80::1', 'port': 9100})),
+    ('network:[::1]', ('network', {'host': '::1', 'port': 9100})),
+    (' network:10.0.0.5:9100\n', ('network', {'host': '10.0.0.5', 'port': 9100})),
+    # Bluetooth: address taken verbatim
+    ('bluetooth:AA:BB:CC:DD:EE:FF', ('bluetooth', {'address': 'AA:BB:CC:DD:EE:FF'})),
+]
+
+MALFORMED_IDS = [
+    'usb:',
+    'usb:0x04b8',
+    'usb:0x04b8:',
+    'usb:0x04b8:0x0202:0x1',
+    'usb:0xZZZZ:0x0202',
+    'network:',
+    'network:10.0.0.5:',
+    'network:10.0.0.5:91OO',
+    'network:printer.local:abc',
+    'network:10.0.0.5:9100:1',
+    'network:10.0.0.5:0',
+    'network:10.0.0.5:70000',
+    'network:fe80::1',
+    'network:[fe80::1',
+    'network:10.0.0.5 :9100',
+    'bluetooth:',
+]
+
+
+@pytest.mark.parametrize('printer_id, expected', VALID_IDS)
+def test_parse_valid_printer_ids(printer_id, expected):
+    assert parse_printer_id(printer_id) == expected
+
+
+@pytest.mark.parametrize('printer_id', MALFORMED_IDS)
+def test_parse_malformed_printer_ids(printer_id):
+    ptype = printer_id.partition(':')[0]
+    with pytest.raises(ValueError, match=f'Invalid {ptype} printer ID'):
+        parse_printer_id(printer_id)
+
+
+@pytest.mark.parametrize('printer_id', ['serial:/dev/ttyUSB0', 'foo', ''])
+def test_parse_unknown_printer_type(printer_id):
+    with pytest.raises(ValueError, match='Unknown printer type'):
+        parse_printer_id(printer_id)